@@ -0,0 +1,309 @@
+"""Headless benchmarks for the 2D Car Game.
+
+Runs under the SDL dummy video driver and writes results to JSON:
+
+    python benchmarks/benchmark.py --out bench.json
+    python benchmarks/benchmark.py --compare bench.json --threshold 0.15
+
+Compare mode re-runs the suite and exits non-zero if any result regressed by
+more than the threshold (a fraction) against the given baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame  # noqa: E402
+
+SCREEN_SIZE = (820, 700)
+ENEMY_COUNTS = (1, 10, 100, 1000)
+ROAD_SIZES = ((820, 700), (1920, 1080), (3840, 2160))
+
+
+def median_ms(fn, repeat=5, number=1):
+    """Median wall time of `number` calls to fn over `repeat` runs, in ms per call"""
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return statistics.median(samples)
+
+
+def result(value, unit, higher_is_better=False):
+    return {"value": round(value, 4), "unit": unit, "higher_is_better": higher_is_better}
+
+
+def bench_sprite_clean(results, repeat):
+    """Decode + background keying per asset"""
+    from sprite_cleaner import ASSETS_DIR, remove_background
+
+    for name in sorted(os.listdir(ASSETS_DIR)):
+        path = os.path.join(ASSETS_DIR, name)
+        if name.startswith("car"):
+            fn = lambda: remove_background(pygame.image.load(path).convert_alpha())
+        else:
+            fn = lambda: pygame.image.load(path).convert()
+        results[f"sprite_load_clean[{name}]"] = result(median_ms(fn, repeat), "ms")
+
+
+def bench_resize(results, repeat):
+    """MainCar.load_car_image through update_screen_size, cold and warm sprite cache"""
+    from main_car import MainCar
+    from sprite_cache import sprite_cache
+
+    widths = (640, 820, 1024, 1280, 1600, 1920)
+    car = MainCar(0, 0, car_number=3, screen_size=SCREEN_SIZE)
+    original_dir, bundle = sprite_cache.cache_dir, sprite_cache.bundle
+
+    def resize_all():
+        for width in widths:
+            car.update_screen_size(width, int(width * 0.85))
+
+    def cold():
+        # empty memory tier and a fresh disk tier
+        with tempfile.TemporaryDirectory() as cache_dir:
+            sprite_cache.cache_dir = cache_dir
+            sprite_cache.clear()
+            resize_all()
+
+    try:
+        # without a bundle: full decode + clean + scale
+        sprite_cache.bundle = None
+        results["resize_load_car_image[cold]"] = result(median_ms(cold, repeat) / len(widths), "ms")
+        if bundle is not None:
+            # with assets.bundle: a smoothscale from the nearest baked tier
+            sprite_cache.bundle = bundle
+            results["resize_load_car_image[cold_bundle]"] = result(median_ms(cold, repeat) / len(widths), "ms")
+        sprite_cache.cache_dir = original_dir
+        results["resize_load_car_image[warm]"] = result(median_ms(resize_all, repeat) / len(widths), "ms")
+    finally:
+        sprite_cache.cache_dir, sprite_cache.bundle = original_dir, bundle
+
+
+def bench_collision(results, repeat):
+    """check_collision calls per second for a hit, a near miss and a far miss"""
+    from collision import check_collision
+    from enemy_car import EnemyCar
+    from main_car import MainCar
+
+    car = MainCar(300, 400, car_number=3, screen_size=SCREEN_SIZE)
+    enemy = EnemyCar(*SCREEN_SIZE)
+    cases = {"hit": (300, 400 - enemy.height + 60), "near_miss": (300, 400 - enemy.height + 5),
+             "far_miss": (300, -enemy.height)}
+    number = 2000
+    for name, (x, y) in cases.items():
+        enemy.x, enemy.y = x, y
+        enemy.rect.topleft = (x, y)
+        ms = median_ms(lambda: check_collision(None, car, enemy), repeat, number)
+        results[f"check_collision[{name}]"] = result(1000 / ms, "calls/s", higher_is_better=True)
+
+
+ENTITY_COUNT = 1000
+
+
+def bench_entities(results, repeat):
+    """Memory per car and the cost of reading its hot attributes, over ENTITY_COUNT cars"""
+    from enemy_car import EnemyCar
+    from main_car import MainCar
+
+    kinds = {"MainCar": lambda: MainCar(300, 400, car_number=3, screen_size=SCREEN_SIZE),
+             "EnemyCar": lambda: EnemyCar(*SCREEN_SIZE)}
+    for name, make in kinds.items():
+        make()  # warm the sprite atlas and geometry cache, so only the cars are measured
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        cars = [make() for _ in range(ENTITY_COUNT)]
+        per_car = (tracemalloc.get_traced_memory()[0] - before) / ENTITY_COUNT
+        tracemalloc.stop()
+        results[f"entity_memory[{name}]"] = result(per_car, "bytes")
+
+        def read():
+            for car in cars:
+                car.x, car.y, car.prev_y, car.width, car.height, car.rect, car.image  # per tick and frame
+
+        results[f"entity_attr_read[{name}]"] = result(median_ms(read, repeat, 100) * 1000 / ENTITY_COUNT, "us")
+        del cars
+
+
+def bench_game_loop(results, seconds):
+    """Steady-state frames per second of start_game with N enemies"""
+    import config
+    import main
+    from profiler import profiler
+    from score_store import ScoreStore
+
+    def instant_retry(screen, road, car, enemy_car, car_start_x, car_start_y, score, resizer=None):
+        # skip the game over screen so crashes don't stall the measurement
+        enemy_car.spawn()
+        car.set_position(car_start_x, car_start_y)
+        return "retry"
+
+    saved = main.show_game_over, main.NUM_ENEMY_CARS, main.RENDER_FPS, main.RECORD_REPLAYS, main.score_store
+    main.show_game_over, main.RENDER_FPS, main.RECORD_REPLAYS = instant_retry, 0, ""
+    scores_dir = tempfile.TemporaryDirectory()
+    # benchmark crashes go to a throwaway database, not the player's leaderboard
+    main.score_store = ScoreStore(os.path.join(scores_dir.name, "scores.db"))
+    try:
+        for count in ENEMY_COUNTS:
+            main.NUM_ENEMY_CARS = count
+            pygame.display.set_mode(SCREEN_SIZE, pygame.RESIZABLE)
+            pygame.event.clear()
+            frames_before = profiler.frame_count
+            pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), 1)
+            start = time.perf_counter()
+            main.start_game(3)
+            elapsed = time.perf_counter() - start
+            results[f"game_loop_fps[{count}]"] = result((profiler.frame_count - frames_before) / elapsed,
+                                                        "fps", higher_is_better=True)
+    finally:
+        main.score_store.close()
+        scores_dir.cleanup()
+        main.show_game_over, main.NUM_ENEMY_CARS, main.RENDER_FPS, main.RECORD_REPLAYS, main.score_store = saved
+        config.NUM_ENEMY_CARS = saved[1]
+
+
+def bench_menu(results, repeat):
+    """Cost of one InitialWindow.run iteration per screen (draw + present)"""
+    from initial_window import InitialWindow
+
+    window = InitialWindow(3)
+    screens = {"main_menu": window.draw_main_menu, "car_selection": window.draw_car_selection,
+               "highest_score": window.draw_highest_score, "instructions": window.draw_instructions}
+    for name, draw in screens.items():
+        def frame():
+            draw()
+            window.dirty_rects.mark_all()
+            window.dirty_rects.present()
+        results[f"menu_redraw[{name}]"] = result(median_ms(frame, repeat, 20), "ms")
+
+
+def bench_road_scroll(results, repeat):
+    """One scrolled road frame (draw + present) per window size, blit path vs SDL2 software renderer"""
+    from road import Road
+    from texture_canvas import TextureCanvas
+
+    for width, height in ROAD_SIZES:
+        screen = pygame.display.set_mode((width, height))
+        road = Road(width, height)
+
+        def frame():
+            road.move()
+            road.draw(screen)
+            pygame.display.flip()
+        results[f"road_scroll[blit,{width}x{height}]"] = result(median_ms(frame, repeat, 20), "ms")
+
+    # a GPU renderer would be the interesting number, but the dummy driver only has the software one
+    for width, height in ROAD_SIZES:
+        canvas = TextureCanvas((width, height), accelerated=0, vsync=False)
+        road = Road(width, height)
+
+        def frame():
+            road.move()
+            canvas.begin_frame((width, height))
+            road.draw(canvas)
+            canvas.present()
+        results[f"road_scroll[sdl2-software,{width}x{height}]"] = result(median_ms(frame, repeat, 20), "ms")
+        canvas.close()
+    pygame.display.set_mode(SCREEN_SIZE, pygame.RESIZABLE)
+
+
+class SlowFilesystem:
+    """ScoreStore persist stand-in that stalls every batch like a slow or networked home directory"""
+
+    def __init__(self, store, delay=0.05):
+        self.store, self.delay = store, delay
+        self.batches = 0
+
+    def __call__(self, ops):
+        time.sleep(self.delay)
+        self.batches += 1
+        self.store.write_batch(ops)
+
+
+def bench_score_record(results, repeat):
+    """Render thread cost of recording a run while the disk takes 50 ms per write"""
+    from score_store import ScoreStore
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ScoreStore(os.path.join(tmp, "scores.db"))
+        store.persist = SlowFilesystem(store)
+        store.start()
+        results["score_record[slow_fs]"] = result(median_ms(lambda: store.record(1, 3, 1.0), repeat, 20), "ms")
+        store.close()
+
+
+def run_suite(repeat=5, seconds=2.0):
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE, pygame.RESIZABLE)
+    results = {}
+    bench_sprite_clean(results, repeat)
+    bench_resize(results, repeat)
+    bench_collision(results, repeat)
+    bench_entities(results, repeat)
+    bench_menu(results, repeat)
+    bench_score_record(results, repeat)
+    bench_game_loop(results, seconds)
+    bench_road_scroll(results, repeat)
+    pygame.quit()
+    return {
+        "meta": {"python": platform.python_version(), "pygame": pygame.version.ver,
+                 "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Return (name, old, new, change) for results that got worse than threshold"""
+    regressions = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old or not old["value"]:
+            continue
+        change = (new["value"] - old["value"]) / old["value"]
+        worse = -change if new["higher_is_better"] else change
+        if worse > threshold:
+            regressions.append((name, old["value"], new["value"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a previous JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression fraction (default 0.10)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seconds", type=float, default=2.0, help="duration of each game loop run")
+    args = parser.parse_args()
+
+    report = run_suite(args.repeat, args.seconds)
+    for name, res in report["results"].items():
+        print(f"{name:<40}{res['value']:>14.3f} {res['unit']}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: {old} -> {new} ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
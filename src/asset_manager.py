@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from dirty_rects import wake
+from sprite_cleaner import ASSETS_DIR, CAR_NAME, IMAGE_EXTENSIONS
+from sprite_bundle import FLAG_OPAQUE
+from sprite_cache import sprite_cache, to_display_format
+
+# posted whenever an asset finishes decoding, so idle screens can redraw progress
+ASSET_LOADED = pygame.event.custom_type()
+
+
+class AssetManager:
+    """Decodes every image in assets/ on a thread pool, starting at launch.
+
+    Images come from the baked bundle when it is current. Otherwise car
+    images are background keyed as part of the decode (through the sprite
+    cache, so MainCar/EnemyCar only have to scale them later). Screens
+    can poll future(name) / progress() and draw something else meanwhile;
+    image(name) waits for the decode if it is still running, and loads
+    synchronously if start() was never called (tools, headless runs).
+    """
+
+    def __init__(self, assets_dir=ASSETS_DIR, max_workers=None):
+        self.assets_dir = assets_dir
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.executor = None
+        self.futures = {}  # file name -> Future of the decoded surface
+        self.surfaces = {}  # file name -> display format surface, made on the main thread
+        self.opaque = set()  # names of images without per-pixel alpha
+
+    def start(self):
+        """Queue every image for decoding and return right away"""
+        if self.executor is not None:
+            return
+        self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="assets")
+        files = os.listdir(self.assets_dir) if os.path.isdir(self.assets_dir) else []
+        names = {name for name in files if name.lower().endswith(IMAGE_EXTENSIONS)}
+        if sprite_cache.bundle is not None:
+            names.update(sprite_cache.bundle.names())
+        for name in sorted(names):
+            future = self.executor.submit(self.decode, name)
+            future.add_done_callback(lambda future: wake(ASSET_LOADED))
+            self.futures[name] = future
+
+    def decode(self, name):
+        """Decoded (and for cars, cleaned and premultiplied) surface; never touches the display"""
+        entry = sprite_cache.baked(name)
+        if entry is not None:
+            if entry.flags & FLAG_OPAQUE:
+                self.opaque.add(name)
+            return sprite_cache.bundle.surface(entry)
+        match = CAR_NAME.fullmatch(name)
+        if match:
+            return sprite_cache.original(int(match.group(1)))
+        surface = pygame.image.load(os.path.join(self.assets_dir, name))
+        if not surface.get_flags() & pygame.SRCALPHA:
+            self.opaque.add(name)
+        return surface
+
+    def future(self, name):
+        return self.futures.get(name)
+
+    def is_ready(self, name):
+        future = self.futures.get(name)
+        return future is not None and future.done()
+
+    def image(self, name):
+        """Display format surface for an asset, waiting for its decode if needed"""
+        surface = self.surfaces.get(name)
+        if surface is None:
+            future = self.futures.get(name)
+            surface = future.result() if future is not None else self.decode(name)
+            # mapped bundle tiers are usually blit-ready already and stay uncopied
+            surface = to_display_format(surface, opaque=name in self.opaque)
+            self.surfaces[name] = surface
+        return surface
+
+    def progress(self):
+        """(decoded, total) asset count"""
+        return sum(future.done() for future in self.futures.values()), len(self.futures)
+
+    @property
+    def done(self):
+        return all(future.done() for future in self.futures.values())
+
+
+asset_manager = AssetManager()
@@ -0,0 +1,78 @@
+"""Bake assets/ into a single display-ready bundle.
+
+Every image is normalized to 32-bit BGRA (the usual display layout, so the
+game can blit tiers straight out of the mapped file). Car images get the background
+keying applied once here and are stored with premultiplied alpha. Each
+asset is written at a few width tiers (never wider than its source), and the
+results are packed into one indexed file that the game maps into memory
+instead of decoding and cleaning PNGs at runtime.
+
+Usage:
+    python src/bake.py                  # writes assets.bundle at the repo root
+    python src/bake.py --out other.bundle
+"""
+import argparse
+import os
+import time
+import pygame
+from sprite_cleaner import ASSETS_DIR, CAR_NAME, IMAGE_EXTENSIONS, remove_background
+from sprite_bundle import BUNDLE_PATH, FLAG_OPAQUE, FLAG_PREMULTIPLIED, source_digest, write_bundle
+
+CAR_TIERS = (64, 128, 256)     # in game cars are 60-250 px wide
+OTHER_TIERS = (256, 512)       # backgrounds get stretched to the window, road1 is only 255 px wide
+
+
+def tier_widths(source_width, tiers):
+    """Tier widths below the source width, plus the largest one the source allows"""
+    return sorted({tier for tier in tiers if tier < source_width} | {min(source_width, tiers[-1])})
+
+
+def bake_asset(path, car):
+    """(flags, full size RGBA surface) for one asset, keyed and premultiplied if it is a car"""
+    image = pygame.image.load(path)
+    if image.get_flags() & pygame.SRCALPHA:
+        rgba = image.copy()  # blitting would blend the alpha in
+    else:
+        rgba = pygame.Surface(image.get_size(), pygame.SRCALPHA, 32)
+        rgba.blit(image, (0, 0))
+    if car:
+        return FLAG_PREMULTIPLIED, remove_background(rgba).premul_alpha()
+    opaque = not image.get_flags() & pygame.SRCALPHA
+    return FLAG_OPAQUE if opaque else 0, rgba
+
+
+def bake(assets_dir=ASSETS_DIR, out=BUNDLE_PATH):
+    entries = []
+    for name in sorted(os.listdir(assets_dir)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        path = os.path.join(assets_dir, name)
+        car = CAR_NAME.fullmatch(name) is not None
+        flags, full = bake_asset(path, car)
+        digest = source_digest(path)
+        width, height = full.get_size()
+        for tier in tier_widths(width, CAR_TIERS if car else OTHER_TIERS):
+            size = (tier, max(1, round(height * tier / width)))
+            # smoothscale filters premultiplied pixels without dark fringes
+            surface = full if size == full.get_size() else pygame.transform.smoothscale(full, size)
+            entries.append((name, digest, surface, flags))
+            print(f"  {name:<12} {size[0]:>5}x{size[1]:<5}")
+    write_bundle(out, entries)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake assets/ into a display-ready sprite bundle")
+    parser.add_argument("--assets", default=ASSETS_DIR)
+    parser.add_argument("--out", default=BUNDLE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = bake(args.assets, args.out)
+    source_bytes = sum(os.path.getsize(os.path.join(args.assets, name)) for name in {e[0] for e in entries})
+    print(f"baked {len(entries)} tiers into {args.out}: {os.path.getsize(args.out)} bytes "
+          f"(sources {source_bytes} bytes) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
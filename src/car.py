@@ -0,0 +1,50 @@
+from sprite_atlas import sprite_atlas
+from road_geometry import road_geometry
+
+
+class Car:
+    """Road geometry and sprite loading shared by the player and enemy cars.
+
+    Slotted: screen and road dimensions come from the shared RoadGeometry
+    instead of being copied onto every car.
+    """
+
+    __slots__ = ("geometry", "sprite", "image", "mask", "width", "height", "rect", "__weakref__")  # atlas loans are weak
+    rotation = 0  # sprite rotation in degrees
+
+    def update_road_boundaries(self, width, height):
+        self.geometry = road_geometry(width, height)
+
+    @property
+    def screen_width(self):
+        return self.geometry.width
+
+    @property
+    def screen_height(self):
+        return self.geometry.height
+
+    @property
+    def road_left_border(self):
+        return self.geometry.border
+
+    road_right_border = road_left_border
+
+    def load_car_image(self):
+        try:
+            # Cleaned, scaled and rotated image, shared through the sprite atlas
+            car_width, car_height = self.geometry.car_size
+            self.sprite = sprite_atlas.borrow(self, self.car_number, (car_width, car_height), rotation=self.rotation)
+            self.image = self.sprite.image
+            self.mask = self.sprite.mask  # collision mask, rebuilt only with the image
+            self.width, self.height = car_width, car_height
+        except Exception as e:
+            # Fall back to a plain rectangle if image loading fails
+            self.width, self.height = 60, 100
+            self.image = None
+            self.mask = None
+
+    def resize_car(self, width, height):
+        """Switch to the road for a new window size, reloading the sprite only if the car size changed"""
+        self.update_road_boundaries(width, height)
+        if self.image is None or (self.width, self.height) != self.geometry.car_size:
+            self.load_car_image()
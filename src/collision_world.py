@@ -0,0 +1,82 @@
+from collision import check_collision
+
+
+class CollisionWorld:
+    """Uniform grid of entity rects for broad-phase collision queries.
+
+    Every entity is stored in the grid cells its rect covers. update() only
+    touches the grid when an entity crosses into different cells, so moving
+    enemies every frame is cheap, and queries only look at nearby entities
+    instead of scanning the whole list.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}       # (cx, cy) -> set of entities
+        self.entity_cells = {}  # entity -> tuple of cells it occupies
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        x0, x1 = rect.left // size, (rect.right - 1) // size
+        y0, y1 = rect.top // size, (rect.bottom - 1) // size
+        return tuple((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+
+    def update(self, entity):
+        """Insert entity or move it to the cells its current rect covers"""
+        rect, size = entity.rect, self.cell_size
+        old_cells = self.entity_cells.get(entity)
+        if old_cells:
+            # cells go column by column, so the first and last give the covered span;
+            # most moves stay inside it and shouldn't build a new tuple
+            (x0, y0), (x1, y1) = old_cells[0], old_cells[-1]
+            if (x0 == rect.left // size and y0 == rect.top // size
+                    and x1 == (rect.right - 1) // size and y1 == (rect.bottom - 1) // size):
+                return
+        new_cells = self._cells_for(rect)
+        if old_cells:
+            for cell in old_cells:
+                bucket = self.cells[cell]
+                bucket.discard(entity)
+                if not bucket:
+                    del self.cells[cell]
+        for cell in new_cells:
+            self.cells.setdefault(cell, set()).add(entity)
+        self.entity_cells[entity] = new_cells
+
+    insert = update
+
+    def remove(self, entity):
+        for cell in self.entity_cells.pop(entity, ()):
+            bucket = self.cells[cell]
+            bucket.discard(entity)
+            if not bucket:
+                del self.cells[cell]
+
+    def clear(self):
+        self.cells.clear()
+        self.entity_cells.clear()
+
+    def query_rect(self, rect, exclude=None):
+        """Entities whose rect overlaps rect"""
+        found = set()
+        for cell in self._cells_for(rect):
+            for entity in self.cells.get(cell, ()):
+                if entity is not exclude and entity not in found and entity.rect.colliderect(rect):
+                    found.add(entity)
+        return found
+
+    def is_free(self, rect, exclude=None):
+        """True when no entity overlaps rect, used to reject overlapping spawns"""
+        for cell in self._cells_for(rect):
+            for entity in self.cells.get(cell, ()):
+                if entity is not exclude and entity.rect.colliderect(rect):
+                    return False
+        return True
+
+    def colliding(self, car, screen=None):
+        """Enemies that really (pixel-mask) collide with car"""
+        return [entity for entity in self.query_rect(car.rect, exclude=car)
+                if check_collision(screen, car, entity)]
+
+    def __len__(self):
+        return len(self.entity_cells)
@@ -1,3 +1,11 @@
 WIDTH = 820
 HEIGHT = 700
-FPS = 60
\ No newline at end of file
+FPS = 60
+NUM_ENEMY_CARS = 1
+DIRTY_RECTS = False
+TICK_RATE = 60  # simulation ticks per second
+RENDER_FPS = None  # frame cap while playing, None = desktop refresh rate (FPS if unknown), 0 = uncapped
+PROFILE_TRACE = ""  # write a per-frame trace here on exit (.json or .csv), empty = off
+RECORD_REPLAYS = ""  # directory to save a replay of every run into, empty = off
+RESIZE_DEBOUNCE = 0.15  # seconds without a new window size before sprites are rebuilt
+RENDER_BACKEND = "blit"  # "sdl2" draws gameplay with the SDL2 renderer (GPU if available), "sdl2-software" forces its software renderer
\ No newline at end of file
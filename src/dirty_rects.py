@@ -0,0 +1,48 @@
+import pygame
+from config import DIRTY_RECTS
+
+
+def wake(event_type):
+    """Post event_type so a loop blocked in wait() runs again, callable from worker threads"""
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(event_type))
+
+
+class DirtyRects:
+    """Optional dirty-rectangle presenter.
+
+    When enabled, screens mark the regions they changed and present() pushes
+    only those through pygame.display.update(rects). Static screens call
+    wait() to sleep until the next event instead of repainting at 60 FPS.
+    When disabled every present() is a plain full-screen flip.
+    """
+
+    def __init__(self, enabled=None):
+        self.enabled = DIRTY_RECTS if enabled is None else enabled
+        self.rects = []
+        self.full = True  # first frame always goes out whole
+
+    def mark(self, rect):
+        self.rects.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        self.full = True
+
+    def present(self):
+        if not self.enabled or self.full:
+            pygame.display.flip()
+        elif self.rects:
+            pygame.display.update(self.rects)
+        self.rects = []
+        self.full = False
+
+    def wait(self):
+        """Block until an event arrives; the event is left in the queue"""
+        if self.enabled and not self.full and not self.rects:
+            # peek instead of wait()+post, which would queue the event behind later ones
+            while not pygame.event.peek():
+                pygame.time.wait(10)
+
+    def animation_ticks(self):
+        """Clock for background animations, frozen while idling between events"""
+        return 0 if self.enabled else pygame.time.get_ticks()
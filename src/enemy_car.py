@@ -1,88 +1,62 @@
 import pygame
-import os 
 import random
-from config import WIDTH, HEIGHT, FPS
+from config import WIDTH, HEIGHT, FPS, TICK_RATE
+from car import Car
+from sprite_cleaner import SPRITE_BLEND
+from timestep import lerp
+from render_queue import CAR_LAYER
 
-class EnemyCar:
-    def __init__(self, screen_width, screen_height, car_number=3):
-        self.screen_width = screen_width
-        self.screen_height = screen_height
+# (score limit, min speed, max speed), speeds in px per second
+SPEED_BANDS = ((10, 240, 360), (20, 360, 420), (35, 420, 540), (None, 540, 720))
+
+
+def speed_range(score):
+    """(min, max) enemy speed for the current score"""
+    for limit, low, high in SPEED_BANDS:
+        if limit is None or score < limit:
+            return low, high
+
+
+
+class EnemyCar(Car):
+    """One enemy car, driving down the road facing the player"""
+
+    __slots__ = ("x", "y", "prev_x", "prev_y", "speed", "car_number", "world", "rng")
+    rotation = 180
+    SPAWN_ATTEMPTS = 10
+    fallback_color = (0, 255, 0)
+
+    def __init__(self, screen_width, screen_height, car_number=3, world=None, rng=None):
         self.car_number = car_number
+        self.world = world  # optional CollisionWorld shared by all enemies
+        self.rng = rng if rng is not None else random  # seeded random.Random for reproducible runs
+        # one rect for the car's whole life, respawns and resizes reset it in place
+        self.rect = pygame.Rect(0, 0, 0, 0)
         # self.speed = random.randint(2, 5) 
         # self.width = 60   
         # self.height = 100
-        self.update_road_boundaries()
+        self.update_road_boundaries(screen_width, screen_height)
         self.load_car_image()
         self.spawn()
 
 
      
 
-    # road bondary calc
-    def update_road_boundaries(self):
-        border_percentage = 0.1
-        self.road_left_border = int(self.screen_width * border_percentage)
-        self.road_right_border = int(self.screen_width * border_percentage)
-        
-        
-    # load car img
-    def load_car_image(self):
-        try:
-            # load img
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            path = os.path.join(current_dir, "assets", f"car{self.car_number}.png")
-            original = pygame.image.load(path).convert_alpha()
-            
-            # rm white bg 
-            cleaned_surface = pygame.Surface(original.get_size(), pygame.SRCALPHA)
-            for x in range(original.get_width()):
-                for y in range(original.get_height()):
-                    pixel = original.get_at((x, y))
-                    r, g, b, a = pixel[0], pixel[1], pixel[2], pixel[3] if len(pixel) > 3 else 255
-                    is_background = (
-                        r >= 255 and g >= 255 and b >= 255 or
-                        r > 240 and g > 240 and b > 240 or
-                        (r > 220 and g > 220 and b > 220 and abs(r-g) < 20 and abs(g-b) < 20) or
-                        a < 10
-                    )
-                    if not is_background:
-                        cleaned_surface.set_at((x, y), pixel)
-            
-            # calc car size
-            road_width = self.screen_width - (2 * int(self.screen_width * 0.1)) 
-            car_width = int(road_width * 0.25)
-            car_width = max(60, min(car_width, 250))
-            car_height = int(car_width * 1.3)
-            
-            self.image = pygame.transform.scale(cleaned_surface, (car_width, car_height))
-            self.image = pygame.transform.rotate(self.image, 180)
-            self.width = car_width
-            self.height = car_height
-            # self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-            
-        except Exception as e:
-            self.image = None
-            self.width = 60
-            self.height = 100
-            self.fallback_color = (0, 255, 0)
-            
     def update_speed(self, score):
-       
-        if score < 10:
-            self.speed = random.randint(4,6)
-        elif score < 20:
-            self.speed = random.randint(6, 7)
-        elif score < 35:
-            self.speed = random.randint(7, 9)
-        else:
-            self.speed = random.randint(9, 12)
+        self.speed = self.rng.randint(*speed_range(score))
         
     
     def spawn(self, score=0):
-        road_width = self.screen_width - (self.road_left_border + self.road_right_border)
-        self.x = random.randint(self.road_left_border, self.road_left_border + road_width - self.width)
         self.y = -self.height
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        # reject spawns overlapping other enemies, give up after a few tries
+        for _ in range(self.SPAWN_ATTEMPTS if self.world is not None else 1):
+            self.x = self.geometry.lane_x(self.rng.randrange(self.geometry.lane_count), self.width)
+            self.rect.update(self.x, self.y, self.width, self.height)
+            if self.world is None or self.world.is_free(self.rect, exclude=self):
+                break
+        self.prev_x, self.prev_y = self.x, self.y  # no interpolation across a respawn
+        if self.world is not None:
+            self.world.update(self)
 
         # set speed based on score
         self.update_speed(score)
@@ -90,43 +64,50 @@ class EnemyCar:
         
         
         
-    def move(self, score=0):
-        self.y += self.speed
-        self.rect.y = self.y
-        if self.y > self.screen_height:
-            self.spawn(score) 
+    def move(self, score=0, dt=1 / TICK_RATE):
+        self.prev_y = self.y
+        self.y += self.speed * dt
+        self.rect.y = int(self.y)
+        if self.y > self.geometry.height:
+            self.spawn(score)
+        elif self.world is not None:
+            self.world.update(self)
         
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        # alpha interpolates between the last two ticks
+        y = lerp(self.prev_y, self.y, alpha)
         if self.image:
-            screen.blit(self.image, (self.x, self.y))
+            screen.blit(self.image, (self.x, y), special_flags=SPRITE_BLEND)
         else:
-            pygame.draw.rect(screen, self.fallback_color, self.rect)
+            pygame.draw.rect(screen, self.fallback_color, (self.x, y, self.width, self.height))
+
+    def submit(self, queue, alpha=1.0):
+        # culled by the queue while waiting above the screen
+        if self.image:
+            queue.submit(self.image, (self.x, lerp(self.prev_y, self.y, alpha)), CAR_LAYER, SPRITE_BLEND)
+        else:
+            queue.call(lambda target: self.draw(target, alpha), CAR_LAYER)
             
             
             
     # upd screen size 
     def update_screen_size(self, width, height):
         # old car position 
-        old_center_x_ratio = (self.x + self.width // 2 - self.road_left_border) / (
-            self.screen_width - self.road_left_border - self.road_right_border)
+        old_center_x_ratio = self.geometry.fraction(self.x + self.width // 2)
         distance_from_top = self.y
         
         # upd new screen size 
-        self.screen_width = width
-        self.screen_height = height
-        self.update_road_boundaries()
-        self.load_car_image()
+        self.resize_car(width, height)
         
-        # recalculate position
-        new_road_width = self.screen_width - (self.road_left_border + self.road_right_border)
-        self.x = int(self.road_left_border + old_center_x_ratio * new_road_width - self.width // 2)
+        # recalculate position, same place across the road and kept on it
+        self.x = self.geometry.clamp_x(int(self.geometry.at(old_center_x_ratio) - self.width // 2), self.width)
         self.y = distance_from_top
-        
-        # boundary check 
-        self.x = max(self.road_left_border, min(self.x, self.screen_width - self.road_right_border - self.width))
         # collision rectangle 
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.rect.update(self.x, int(self.y), self.width, self.height)
+        self.prev_x, self.prev_y = self.x, self.y
+        if self.world is not None:
+            self.world.update(self)
         
     def get_rect(self):
         return self.rect
@@ -0,0 +1,197 @@
+import numpy as np
+import pygame
+from config import TICK_RATE
+from enemy_car import speed_range
+from road_geometry import road_geometry
+from render_queue import CAR_LAYER
+from sprite_atlas import sprite_atlas
+from sprite_cleaner import SPRITE_BLEND
+from timestep import lerp
+
+
+class EnemyPool:
+    """Struct-of-arrays enemy traffic backed by NumPy.
+
+    Positions, speeds and alive flags live in arrays, so a frame advances
+    every enemy in one vectorized step and off-screen slots are respawned in
+    bulk with the same rules as EnemyCar (score speed bands, a random
+    lane). All enemies share one atlas sprite and are drawn with a
+    single Surface.blits call.
+
+    Every slot also gets its EnemyView record up front. Respawning only
+    rewrites array entries and view() hands out the slot's record, so
+    steady-state gameplay allocates no enemy objects.
+    """
+
+    def __init__(self, capacity, screen_width, screen_height, car_number=3, seed=None, count=None):
+        self.capacity = capacity
+        self.car_number = car_number
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.prev_y = np.zeros(capacity, dtype=np.float64)  # y at the previous tick
+        self.speed = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.records = [EnemyView(self, index) for index in range(capacity)]
+        self.update_screen_size(screen_width, screen_height, respawn=False)
+        self.count = capacity if count is None else count
+        self.restart(seed)
+
+    def restart(self, seed=None):
+        """Back to a freshly built pool's traffic for seed, reusing every array and record"""
+        self.rng = np.random.default_rng(seed)
+        self.alive[:] = False
+        self.alive[:self.count] = True
+        self.spawn(np.flatnonzero(self.alive))
+
+    def update_road_boundaries(self):
+        self.geometry = road_geometry(self.screen_width, self.screen_height)
+        self.road_left_border = self.road_right_border = self.geometry.border
+        self.lane_xs = np.array([self.geometry.lane_x(lane) for lane in range(self.geometry.lane_count)],
+                                dtype=np.int32)
+
+    def load_car_image(self):
+        self.width, self.height = self.geometry.car_size
+        try:
+            self.sprite = sprite_atlas.borrow(self, self.car_number, (self.width, self.height), rotation=180)
+            self.image, self.mask = self.sprite.image, self.sprite.mask
+        except Exception:
+            self.image = None
+            # views are read-only, so give them the full-rect mask collision.get_mask would build
+            self.mask = pygame.mask.Mask((self.width, self.height), fill=True)
+            self.fallback_color = (0, 255, 0)
+
+    def update_screen_size(self, width, height, respawn=True):
+        """Rescale the shared sprite and keep every enemy inside the new road"""
+        if respawn:
+            center_ratio = self.geometry.fraction(self.x + self.width // 2)
+        self.screen_width, self.screen_height = width, height
+        self.update_road_boundaries()
+        if not respawn or self.image is None or (self.width, self.height) != self.geometry.car_size:
+            self.load_car_image()
+        if respawn:
+            geometry = self.geometry
+            new_x = (geometry.at(center_ratio) - self.width // 2).astype(np.int32)
+            self.x[:] = np.clip(new_x, geometry.left, max(geometry.left, geometry.right - self.width))
+
+    def spawn(self, indices, score=0):
+        """Respawn the given slots above the screen"""
+        if len(indices) == 0:
+            return
+        low_speed, high_speed = speed_range(score)
+        self.x[indices] = self.lane_xs[self.rng.integers(0, len(self.lane_xs), size=len(indices))]
+        self.y[indices] = -self.height
+        self.prev_y[indices] = -self.height
+        self.speed[indices] = self.rng.integers(low_speed, high_speed + 1, size=len(indices))
+
+    def step(self, score=0, dt=1 / TICK_RATE):
+        """Move every alive enemy and recycle the ones that left the screen"""
+        np.copyto(self.prev_y, self.y)
+        self.y += self.speed * dt * self.alive
+        self.spawn(np.flatnonzero(self.alive & (self.y > self.screen_height)), score)
+
+    move = step
+
+    def kill(self, index):
+        self.alive[index] = False
+
+    def revive(self, index, score=0):
+        self.alive[index] = True
+        self.spawn([index], score)
+
+    def visible(self):
+        """Indices of alive enemies that are at least partly on screen"""
+        return np.flatnonzero(self.alive & (self.y + self.height > 0) & (self.y < self.screen_height))
+
+    def overlapping(self, rect):
+        """Indices of alive enemies whose bounding box overlaps rect"""
+        hit = (self.alive
+               & (self.x < rect.right) & (self.x + self.width > rect.left)
+               & (self.y < rect.bottom) & (self.y + self.height > rect.top))
+        return np.flatnonzero(hit)
+
+    def draw(self, screen, alpha=1.0):
+        idx = self.visible()
+        y = self.prev_y[idx] + (self.y[idx] - self.prev_y[idx]) * alpha
+        positions = zip(self.x[idx].tolist(), y.tolist())
+        if self.image:
+            screen.blits([(self.image, pos, None, SPRITE_BLEND) for pos in positions], doreturn=False)
+        else:
+            for x, y in positions:
+                pygame.draw.rect(screen, self.fallback_color, (x, y, self.width, self.height))
+
+    def submit(self, queue, alpha=1.0):
+        """Queue every visible enemy at once, culled in NumPy rather than per command"""
+        if not self.image:
+            queue.call(lambda target: self.draw(target, alpha), CAR_LAYER)
+            return
+        idx = self.visible()
+        y = self.prev_y[idx] + (self.y[idx] - self.prev_y[idx]) * alpha
+        queue.submit_many(self.image, zip(self.x[idx].tolist(), y.tolist()), CAR_LAYER, SPRITE_BLEND)
+
+    def view(self, index):
+        """The slot's preallocated record"""
+        return self.records[index]
+
+    def views(self):
+        return [self.records[i] for i in np.flatnonzero(self.alive)]
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+
+class EnemyView:
+    """EnemyCar compatible view of one pool slot, created once per slot by the pool"""
+
+    __slots__ = ("pool", "index", "_rect")
+
+    def __init__(self, pool, index):
+        self.pool, self.index = pool, int(index)
+        self._rect = pygame.Rect(0, 0, 0, 0)
+
+    x = property(lambda self: int(self.pool.x[self.index]),
+                 lambda self, value: self.pool.x.__setitem__(self.index, value))
+    y = property(lambda self: float(self.pool.y[self.index]),
+                 lambda self, value: self.pool.y.__setitem__(self.index, value))
+    speed = property(lambda self: int(self.pool.speed[self.index]),
+                     lambda self, value: self.pool.speed.__setitem__(self.index, value))
+    width = property(lambda self: self.pool.width)
+    height = property(lambda self: self.pool.height)
+    image = property(lambda self: self.pool.image)
+    mask = property(lambda self: self.pool.mask)
+    car_number = property(lambda self: self.pool.car_number)
+    screen_width = property(lambda self: self.pool.screen_width)
+    screen_height = property(lambda self: self.pool.screen_height)
+    road_left_border = property(lambda self: self.pool.road_left_border)
+    road_right_border = property(lambda self: self.pool.road_right_border)
+
+    @property
+    def rect(self):
+        """The slot's bounding box, one Rect updated in place on every read"""
+        self._rect.update(self.x, int(self.y), self.width, self.height)
+        return self._rect
+
+    def get_rect(self):
+        return self.rect
+
+    def update_speed(self, score):
+        low, high = speed_range(score)
+        self.speed = int(self.pool.rng.integers(low, high + 1))
+
+    def spawn(self, score=0):
+        self.pool.spawn([self.index], score)
+
+    def move(self, score=0, dt=1 / TICK_RATE):
+        self.pool.prev_y[self.index] = self.y
+        self.y += self.speed * dt
+        if self.y > self.screen_height:
+            self.spawn(score)
+
+    def draw(self, screen, alpha=1.0):
+        y = lerp(float(self.pool.prev_y[self.index]), self.y, alpha)
+        if self.image:
+            screen.blit(self.image, (self.x, y), special_flags=SPRITE_BLEND)
+        else:
+            pygame.draw.rect(screen, self.pool.fallback_color, self.rect)
+
+    def update_screen_size(self, width, height):
+        self.pool.update_screen_size(width, height)
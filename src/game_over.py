@@ -1,30 +1,34 @@
 import pygame
 from config import WIDTH, HEIGHT
-from high_score import update_highscore, load_highscore
+from score_store import score_store
+from text_cache import render_text
+from dirty_rects import DirtyRects
 
-def show_game_over(screen, road, car, enemy_car, car_start_x, car_start_y, score):
-    font = pygame.font.Font(None, 74)
-    mid_font = pygame.font.Font(None, 50)
-    small_font = pygame.font.Font(None, 36)
-    
-    curr_high = update_highscore(score)
+def show_game_over(screen, road, car, enemy_car, car_start_x, car_start_y, score, resizer=None):
+    # the run was recorded before this screen; the in-memory best, never waits on the disk
+    curr_high = max(score, score_store.high_score())
     
     bg_color = (30, 30, 50)         # Dark blue-gray
     button_color = (70, 130, 180)   # Steel blue
     button_hover_color = (100, 149, 237)  # Cornflower blue
     text_color = (255, 255, 255)    # White
     
-    game_over_text = font.render("Game Over", True, (255, 0, 0))
-    score_text = mid_font.render(f"Final Score: {score}", True, text_color)
-    highscore_text = small_font.render(f"High Score: {curr_high}", True, (255, 215, 0)) 
-    again = small_font.render("Try Again", True, text_color)
-    menu_text = small_font.render("Main Menu", True, text_color)
-    quit_text = small_font.render("Quit", True, text_color)
+    game_over_text = render_text("Game Over", 74, (255, 0, 0))
+    score_text = render_text(f"Final Score: {score}", 50, text_color)
+    highscore_text = render_text(f"High Score: {curr_high}", 36, (255, 215, 0)) 
+    again = render_text("Try Again", 36, text_color)
+    menu_text = render_text("Main Menu", 36, text_color)
+    quit_text = render_text("Quit", 36, text_color)
     
     # again_rect = pygame.Rect(WIDTH//2 - 100, HEIGHT//2 + 20, 200, 50)
     # quit_rect = pygame.Rect(WIDTH//2 - 100, HEIGHT//2 + 90, 200, 50)
 
+    dirty = DirtyRects()
+    hovered = None
     while True:
+        dirty.wait()  # in dirty-rect mode, idle until something happens
+        if resizer is not None:
+            resizer.poll()
         width, height = screen.get_size()
         
         # rectangle for buttons
@@ -38,14 +42,22 @@ def show_game_over(screen, road, car, enemy_car, car_start_x, car_start_y, score
         # road.draw(screen)
         line_color = (100, 100, 120)
         for i in range(0, height + 50, 50):
-            y = (i + pygame.time.get_ticks() // 10) % (height + 50)
+            y = (i + dirty.animation_ticks() // 10) % (height + 50)
             pygame.draw.rect(screen, line_color, (width // 2 - 5, y, 10, 30))
         
         screen.blit(game_over_text, (width//2 - game_over_text.get_width()//2, height//2 - game_over_text.get_height()//2-150)) #gameover 
         screen.blit(score_text, (width//2 - score_text.get_width()//2, height//2 - score_text.get_height()//2 - 65))
         screen.blit(highscore_text, (width//2 - highscore_text.get_width()//2, height//2 - highscore_text.get_height()//2 -18))
         mouse_pos = pygame.mouse.get_pos()
-        
+
+        # only buttons whose hover state flipped need to go out
+        buttons = (again_rect, menu_rect, quit_rect)
+        now_hovered = tuple(rect.collidepoint(mouse_pos) for rect in buttons)
+        if hovered is not None:
+            for rect, old, new in zip(buttons, hovered, now_hovered):
+                if old != new:
+                    dirty.mark(rect)
+        hovered = now_hovered
         
         # Try Again button with hover
         if again_rect.collidepoint(mouse_pos):
@@ -77,7 +89,7 @@ def show_game_over(screen, road, car, enemy_car, car_start_x, car_start_y, score
         screen.blit(quit_text, quit_text.get_rect(center=quit_rect.center))
         
                 
-        pygame.display.flip()
+        dirty.present()
         
         
         for i in pygame.event.get():
@@ -87,9 +99,13 @@ def show_game_over(screen, road, car, enemy_car, car_start_x, car_start_y, score
                 
             elif i.type == pygame.VIDEORESIZE:
                 screen = pygame.display.set_mode(i.size, pygame.RESIZABLE)
-                road.set_size(i.size[0], i.size[1])
-                car.update_screen_size(i.size[0], i.size[1])
-                enemy_car.update_screen_size(i.size[0], i.size[1])
+                dirty.mark_all()
+                if resizer is not None:
+                    resizer.request(*i.size)  # rescaled in the background like during play
+                else:
+                    road.set_size(i.size[0], i.size[1])
+                    car.update_screen_size(i.size[0], i.size[1])
+                    enemy_car.update_screen_size(i.size[0], i.size[1])
                 
             elif i.type == pygame.MOUSEBUTTONDOWN:
                 if again_rect.collidepoint(i.pos):
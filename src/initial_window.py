@@ -1,6 +1,11 @@
 import pygame
-import os
 from config import WIDTH, HEIGHT
+from text_cache import get_font, render_text
+from dirty_rects import DirtyRects
+from asset_manager import asset_manager, ASSET_LOADED
+from sprite_cleaner import SPRITE_BLEND
+from score_store import score_store, SCORES_LOADED
+from render_queue import RenderQueue, HUD_LAYER
 
 class Button:
     """
@@ -16,22 +21,36 @@ class Button:
         self.font_size = font_size
         self.is_hovered = False
         self.rect = pygame.Rect(0, 0, 0, 0)  # Will be set in update_rect
-        self.font = pygame.font.Font(None, self.font_size)
+        self.font = get_font(self.font_size)
+        self.faces = {}  # (size, hovered) -> prerendered button
 
     def update_rect(self, win_width, win_height):
         """Update button rect based on current window size and percentages."""
         w, h = int(min(250,self.w_perc * win_width)), int(min(50,self.h_perc * win_height))
         x, y = int(self.x_perc * win_width - w // 2), int(self.y_perc * win_height - h // 2)
         self.rect = pygame.Rect(x, y, w, h)
-        self.font = pygame.font.Font(None, self.font_size)
+
+    def face(self):
+        """Fill, border and label as one surface, rendered once per size and hover state"""
+        key = (self.rect.size, self.is_hovered)
+        face = self.faces.get(key)
+        if face is None:
+            if len(self.faces) >= 4:
+                self.faces.clear()  # window was resized, old sizes won't come back soon
+            face = pygame.Surface(self.rect.size)
+            face.fill(self.hover_color if self.is_hovered else self.color)
+            pygame.draw.rect(face, (255, 255, 255), face.get_rect(), 3)  # White border
+            text_surface = render_text(self.label, self.font_size, self.text_color)
+            face.blit(text_surface, text_surface.get_rect(center=face.get_rect().center))
+            face = self.faces[key] = face.convert() if pygame.display.get_surface() else face
+        return face
 
     def draw(self, screen):
         """Draw the button on screen."""
-        color = self.hover_color if self.is_hovered else self.color
-        pygame.draw.rect(screen, color, self.rect)
-        pygame.draw.rect(screen, (255, 255, 255), self.rect, 3)  # White border
-        text_surface = self.font.render(self.label, True, self.text_color)
-        screen.blit(text_surface, text_surface.get_rect(center=self.rect.center))
+        screen.blit(self.face(), self.rect)
+
+    def submit(self, queue):
+        queue.submit(self.face(), self.rect.topleft, HUD_LAYER)
     
     def handle_event(self, event):
         """Handle mouse events for the button."""
@@ -49,20 +68,19 @@ class CarPreview:
         self.load_car_images()
         
     def load_car_images(self):
-        """Load preview images for cars"""
-        try:
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            car_size_x = min(120,pygame.display.get_surface().get_width() * 0.15)
-            car_size_y = min(150, pygame.display.get_surface().get_width() * 0.15 * 1.3)
-            for car_num in range(3, 6):  # Cars 3, 4, 5
-                assets_path = os.path.join(current_dir, "assets", f"car{car_num}.png")
-                if os.path.exists(assets_path):
-                    original = pygame.image.load(assets_path).convert_alpha()
-                    self.car_images[car_num] = pygame.transform.scale(original, (car_size_x, car_size_y))
-        except Exception as e:
-            # print(f"Error loading car images: {e}")
-            colors = {3: (255, 0, 0), 4: (0, 255, 0), 5: (0, 0, 255)}
-            for car_num in range(3, 6):
+        """Pick up preview images for cars 3-5 the asset manager has finished"""
+        car_size_x = min(120,pygame.display.get_surface().get_width() * 0.15)
+        car_size_y = min(150, pygame.display.get_surface().get_width() * 0.15 * 1.3)
+        for car_num in range(3, 6):  # Cars 3, 4, 5
+            name = f"car{car_num}.png"
+            if car_num in self.car_images or not asset_manager.is_ready(name):
+                continue
+            try:
+                original = asset_manager.image(name)
+                self.car_images[car_num] = pygame.transform.scale(original, (car_size_x, car_size_y))
+            except Exception as e:
+                # print(f"Error loading car images: {e}")
+                colors = {3: (255, 0, 0), 4: (0, 255, 0), 5: (0, 0, 255)}
                 surface = pygame.Surface((80, 100))
                 surface.fill(colors[car_num])
                 self.car_images[car_num] = surface
@@ -72,10 +90,16 @@ class CarPreview:
         win_w, win_h = screen.get_width(), screen.get_height()
         car_size_x = int(min(120, win_w * 0.15))
         car_size_y = int(min(150, win_w * 0.15 * 1.25))
+        if self.current_car not in self.car_images:
+            self.load_car_images()
         if self.current_car in self.car_images:
             # Always scale at draw time for correct size
             img = pygame.transform.smoothscale(self.car_images[self.current_car], (car_size_x, car_size_y))
-            screen.blit(img, (win_w // 2 - car_size_x // 2, win_h // 2-car_size_y))
+            screen.blit(img, (win_w // 2 - car_size_x // 2, win_h // 2-car_size_y), special_flags=SPRITE_BLEND)
+        else:
+            # still decoding in the background
+            text = render_text("Loading...", 28, (200, 200, 200))
+            screen.blit(text, text.get_rect(center=(win_w // 2, win_h // 2 - car_size_y // 2)))
 
 class InitialWindow:
     """Main menu window for the 2D Car Game"""
@@ -89,6 +113,8 @@ class InitialWindow:
         self.screen = pygame.display.set_mode((self.window_width, self.window_height), pygame.RESIZABLE)
         pygame.display.set_caption("2D Car Game - Main Menu")
         self.clock = pygame.time.Clock()
+        self.dirty_rects = DirtyRects()
+        self.render_queue = RenderQueue()
         
         # Colors
         self.bg_color = (30, 30, 50)  # Dark blue-gray
@@ -97,8 +123,8 @@ class InitialWindow:
         self.text_color = (255, 255, 255)  # White
         
         # Fonts
-        self.title_font = pygame.font.Font(None, 72)
-        self.subtitle_font = pygame.font.Font(None, 36)
+        self.title_font = get_font(72)
+        self.subtitle_font = get_font(36)
         
         # Game state
         self.selected_car = initial_car        # Use passed car number
@@ -150,39 +176,40 @@ class InitialWindow:
         # Draw some road-like lines for visual appeal
         line_color = (100, 100, 120)
         for i in range(0, self.window_height + 50, 50):
-            y = (i + pygame.time.get_ticks() // 10) % (self.window_height + 50)
+            y = (i + self.dirty_rects.animation_ticks() // 10) % (self.window_height + 50)
             pygame.draw.rect(self.screen, line_color, (self.window_width // 2 - 5, y, 10, 30))
     
     def draw_title(self):
         """Draw the game title"""
-        title_text = self.title_font.render("2D CAR GAME", True, self.text_color)
+        title_text = render_text("2D CAR GAME", 72, self.text_color)
         self.screen.blit(title_text, title_text.get_rect(center=(self.window_width // 2, self.window_height // 5)))
-        subtitle_text = self.subtitle_font.render("Drive and Survive!", True, (200, 200, 200))
+        subtitle_text = render_text("Drive and Survive!", 36, (200, 200, 200))
         self.screen.blit(subtitle_text, subtitle_text.get_rect(center=(self.window_width // 2, self.window_height // 5 + 50)))
     
     def draw_main_menu(self):
         self.draw_background()
         self.draw_title()
-        for btn in ['new_game', 'change_car', 'highest_score', 'instructions', 'quit']: self.buttons[btn].draw(self.screen)
+        self.draw_buttons('new_game', 'change_car', 'highest_score', 'instructions', 'quit')
+
+    def draw_buttons(self, *names):
+        """Draw buttons with one blits call"""
+        self.render_queue.begin(self.screen)
+        for name in names:
+            self.buttons[name].submit(self.render_queue)
+        self.render_queue.flush()
     
     def draw_car_selection(self):
         self.draw_background()
         title_size, instruction_size, small_text_size = max(48, min(72, int(self.window_height * 0.08))), max(24, min(36, int(self.window_height * 0.04))), max(20, min(28, int(self.window_height * 0.03)))
-        title_font = pygame.font.Font(None, title_size)
-        title_text = title_font.render("SELECT YOUR CAR", True, self.text_color)
+        title_text = render_text("SELECT YOUR CAR", title_size, self.text_color)
         self.screen.blit(title_text, title_text.get_rect(center=(self.window_width // 2, self.window_height // 5)))
         self.car_preview.current_car = self.preview_car  # Use preview_car for preview
         self.car_preview.draw(self.screen)
         
         # Car selection buttons
-        self.buttons['prev_car'].draw(self.screen)
-        self.buttons['next_car'].draw(self.screen)
-        self.buttons['select_car'].draw(self.screen)
+        self.draw_buttons('prev_car', 'next_car', 'select_car')
         
         # Instructions with proper spacing
-        instruction_font = pygame.font.Font(None, instruction_size)
-        small_font = pygame.font.Font(None, small_text_size)
-        
         # Split long instruction text if needed
         instruction_y = self.window_height // 2 + self.window_height // 6
         
@@ -199,37 +226,32 @@ class InitialWindow:
         #     esc_y = instruction_y + (instruction_size + 5) * 2 + 10
         # else:
             # For larger screens, keep it on one line
-        instruction_text = instruction_font.render("Use Previous/Next or Arrow Keys to choose your car", True, (200, 200, 200))
+        instruction_text = render_text("Use Previous/Next or Arrow Keys to choose your car", instruction_size, (200, 200, 200))
         instruction_rect = instruction_text.get_rect(center=(self.window_width // 2, instruction_y))
         self.screen.blit(instruction_text, instruction_rect)
         esc_y = self.screen.get_height() - 50
         
         # ESC instruction
-        esc_text = small_font.render("Press ESC to return to main menu", True, (150, 150, 150))
+        esc_text = render_text("Press ESC to return to main menu", small_text_size, (150, 150, 150))
         esc_rect = esc_text.get_rect(center=(self.window_width // 2, esc_y))
         self.screen.blit(esc_text, esc_rect)
 
     def draw_highest_score(self):
         """Draw the highest score screen with a reset button"""
         self.draw_background()
-        title_font = pygame.font.Font(None, max(56, int(self.window_height * 0.1)))
-        score_font = pygame.font.Font(None, max(48, int(self.window_height * 0.08)))
-        small_font = pygame.font.Font(None, max(24, int(self.window_height * 0.04)))
+        title_size = max(56, int(self.window_height * 0.1))
+        score_size = max(48, int(self.window_height * 0.08))
+        small_size = max(24, int(self.window_height * 0.04))
 
         # Title
-        title = title_font.render("HIGHEST SCORE", True, self.text_color)
+        title = render_text("HIGHEST SCORE", title_size, self.text_color)
         self.screen.blit(title, title.get_rect(center=(self.window_width // 2, self.window_height // 2.5)))
 
-        # Load high score from file
-        try:
-            with open("highscore.txt", "r") as f:
-                highscore = int(f.read().strip())
-        except Exception:
-            highscore = 0
+        highscore = score_store.high_score()
 
         # Draw a highlighted box for the score
         score_str = f"{highscore}"
-        score_text = score_font.render(score_str, True, (30, 30, 30))
+        score_text = render_text(score_str, score_size, (30, 30, 30))
         score_rect = score_text.get_rect(center=(self.window_width // 2, self.window_height // 2))
 
         # Padding for the box
@@ -258,7 +280,7 @@ class InitialWindow:
         self.buttons['reset_highscore'].draw(self.screen)
 
         # ESC instruction
-        esc_text = small_font.render("Press ESC to return to main menu", True, (150, 150, 150))
+        esc_text = render_text("Press ESC to return to main menu", small_size, (150, 150, 150))
         esc_rect = esc_text.get_rect(center=(self.window_width // 2, self.window_height - 50))
         self.screen.blit(esc_text, esc_rect)
     
@@ -272,8 +294,7 @@ class InitialWindow:
         text_size = max(20, min(30, int(self.window_height * 0.035)))
         
         # Title
-        title_font = pygame.font.Font(None, title_size)
-        title_text = title_font.render("GAME INSTRUCTIONS", True, self.text_color)
+        title_text = render_text("GAME INSTRUCTIONS", title_size, self.text_color)
         title_rect = title_text.get_rect(center=(self.window_width // 2, self.window_height // 8))
         self.screen.blit(title_text, title_rect)
         
@@ -285,6 +306,7 @@ class InitialWindow:
             ("LEFT/RIGHT ARROWS - Change car in selection", "text"),
             ("Numbers 1, 2, 3 - Change car model during game", "text"),
             ("ESC - Return to main menu", "text"),
+            ("F3 - Show frame timing overlay", "text"),
             ("", "empty"),
             ("GAME OBJECTIVES:", "header"),
             ("", "empty"),
@@ -311,9 +333,9 @@ class InitialWindow:
         y_start = self.window_height // 8 + title_size + 30
         cur_y = y_start
         
-        # Create fonts
-        header_font = pygame.font.Font(None, header_size)
-        text_font = pygame.font.Font(None, text_size)
+        # Shared fonts, only used to measure text for truncation
+        header_font = get_font(header_size)
+        text_font = get_font(text_size)
         
         for info_text, info_type in instructions_info:
             if info_type == "empty":
@@ -322,15 +344,15 @@ class InitialWindow:
             
             if info_type == "header":
                 color = self.text_color
-                font = header_font
+                font, font_size = header_font, header_size
                 cur_y += line_spacing // 4  # Extra space before headers
             else:
                 color = (200, 200, 200)
-                font = text_font
+                font, font_size = text_font, text_size
             
             # Check if text fits on screen, truncate if necessary
             max_width = self.window_width - 40  # 20px margin on each side
-            text_surface = font.render(info_text, True, color)
+            text_surface = render_text(info_text, font_size, color)
             
             if text_surface.get_width() > max_width:
                 # Truncate text if it's too long
@@ -343,12 +365,12 @@ class InitialWindow:
                     else:
                         truncated_text = truncated_text.rstrip() + "..."
                         break
-                text_surface = font.render(truncated_text, True, color)
+                text_surface = render_text(truncated_text, font_size, color)
             
             # Check if we have enough vertical space
             if cur_y + line_spacing > self.window_height - 50:
                 # Add "..." if we run out of space
-                dots_surface = text_font.render("... (press ESC to return)", True, (150, 150, 150))
+                dots_surface = render_text("... (press ESC to return)", text_size, (150, 150, 150))
                 dots_rect = dots_surface.get_rect(center=(self.window_width // 2, self.window_height - 30))
                 self.screen.blit(dots_surface, dots_rect)
                 break
@@ -363,6 +385,10 @@ class InitialWindow:
                 self.running = False
                 return
             
+            # Anything but mouse motion may change what the whole screen shows
+            if event.type in (pygame.VIDEORESIZE, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, ASSET_LOADED, SCORES_LOADED):
+                self.dirty_rects.mark_all()
+
             if event.type == pygame.VIDEORESIZE:
                 # Handle window resize
                 self.window_width, self.window_height = event.size
@@ -410,23 +436,41 @@ class InitialWindow:
 
     def handle_highest_score_events(self, event):
         if self.buttons['reset_highscore'].handle_event(event):
-            # Reset high score file
-            with open("highscore.txt", "w") as f:
-                f.write("0")
-                # self.show_options = False
+            # Off the leaderboard, the runs stay in the history
+            score_store.reset_high_score()
+            self.dirty_rects.mark_all()
+
+    def draw_loading(self):
+        """Asset decode progress along the bottom of the window, until everything is in"""
+        done, total = asset_manager.progress()
+        if done == total:
+            return
+        bar = pygame.Rect(self.window_width // 4, self.window_height - 16, self.window_width // 2, 6)
+        pygame.draw.rect(self.screen, (60, 60, 80), bar)
+        pygame.draw.rect(self.screen, self.button_hover_color, (bar.x, bar.y, bar.width * done // total, bar.height))
+        text = render_text(f"Loading assets {done}/{total}", 20, (150, 150, 150))
+        self.screen.blit(text, text.get_rect(midbottom=(self.window_width // 2, bar.y - 4)))
 
     def run(self):
         """Run the main menu"""
         while self.running:
+            self.dirty_rects.wait()  # idle until an event in dirty-rect mode
+            hovered = {name: btn.is_hovered for name, btn in self.buttons.items()}
             self.handle_events()
+
+            # Buttons whose hover state flipped are the only other changes
+            for name, btn in self.buttons.items():
+                if btn.is_hovered != hovered[name]:
+                    self.dirty_rects.mark(btn.rect)
             
             # Draw current screen
             if self.show_options == "car_selection": self.draw_car_selection()
             elif self.show_options == "instructions": self.draw_instructions()
             elif self.show_options == "highest_score": self.draw_highest_score()
             else: self.draw_main_menu()
+            self.draw_loading()
 
-            pygame.display.flip()
+            self.dirty_rects.present()
             self.clock.tick(60)
         
         if self.start_game:
@@ -0,0 +1,23 @@
+from collections import namedtuple
+import pygame
+
+# keys that steer the player car
+LEFT_KEYS = (pygame.K_LEFT, pygame.K_a, pygame.K_KP_4)
+RIGHT_KEYS = (pygame.K_RIGHT, pygame.K_d, pygame.K_KP_6)
+UP_KEYS = (pygame.K_UP, pygame.K_w, pygame.K_KP_8)
+DOWN_KEYS = (pygame.K_DOWN, pygame.K_s, pygame.K_KP_2)
+
+
+class Inputs(namedtuple("Inputs", "left right up down")):
+    """Steering state for one simulation tick, independent of pygame's key state"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_keys(cls, keys):
+        """Build from a pygame.key.get_pressed() style sequence"""
+        return cls(any(keys[k] for k in LEFT_KEYS), any(keys[k] for k in RIGHT_KEYS),
+                   any(keys[k] for k in UP_KEYS), any(keys[k] for k in DOWN_KEYS))
+
+
+NO_INPUT = Inputs(False, False, False, False)
@@ -1,125 +1,274 @@
+import atexit
+import random
 import pygame
-from config import WIDTH, HEIGHT, FPS
-from road import Road
-from main_car import MainCar
-from enemy_car import EnemyCar
+from config import WIDTH, HEIGHT, FPS, NUM_ENEMY_CARS, TICK_RATE, RENDER_FPS, PROFILE_TRACE, RECORD_REPLAYS
 from game_over import show_game_over
 from initial_window import show_main_menu  # Menu screen
-from score import Score
-from collision import check_collision
+from simulation import Simulation
+from inputs import Inputs
+from text_cache import render_text
+from dirty_rects import DirtyRects
+from timestep import FixedTimestep
+from profiler import profiler
+from replay import ReplayRecorder
+from resize_coordinator import ResizeCoordinator
+from asset_manager import asset_manager
+from texture_canvas import open_canvas
+from score_store import score_store
+from render_queue import HUD_LAYER
 
 
-def start_game(selected_car=3):
+def save_recording(recorder, sim, hit=None):
+    """Write a run's replay log if recording is on"""
+    if recorder is not None:
+        recorder.finish(sim.ticks if hit is not None else None, sim.score.get_score())
+        recorder.save(RECORD_REPLAYS)
+
+
+def render_frame_cap():
+    """Frames per second to cap gameplay at, RENDER_FPS or the desktop refresh rate"""
+    if RENDER_FPS is not None:
+        return RENDER_FPS
+    # only pygame-ce can ask for the refresh rate
+    refresh_rate = getattr(pygame.display, "get_current_refresh_rate", lambda: 0)()
+    return refresh_rate or FPS
+
+
+def render_score_box(score):
+    """Score text on its rounded background box, as one surface"""
+    text = render_text(f"Score: {score}", 48, (255, 255, 255))
+    box = pygame.Surface((text.get_width() + 20, text.get_height() + 10), pygame.SRCALPHA)
+    pygame.draw.rect(box, (25, 25, 25), box.get_rect(), border_radius=8)
+    box.blit(text, (10, 5))
+    return box
+
+
+def start_game(selected_car=3, replay=None, speed=1.0):
     # Get the actual current screen size 
     current_surface = pygame.display.get_surface()
     current_width = current_surface.get_width() if current_surface else WIDTH
     current_height = current_surface.get_height() if current_surface else HEIGHT
+    if replay is not None:
+        # a replay starts from the recorded window size
+        current_width, current_height = replay.size
 
     # Ensure the screen is properly set to the current size
     screen = pygame.display.set_mode((current_width, current_height), pygame.RESIZABLE)
     pygame.display.set_caption("2D Car Game")
+    # with an SDL2 backend gameplay draws to a renderer canvas, menus stay on display surfaces
+    canvas = open_canvas((current_width, current_height))
+    screen = canvas or pygame.display.get_surface()
+
+    def leave(result):
+        if canvas is not None:
+            canvas.close()
+        return result
+
+    def set_window_size(size):
+        nonlocal screen
+        if canvas is not None:
+            canvas.window.size = size
+        else:
+            screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+
+    # Game logic lives in the simulation, this loop adds events and drawing.
+    # The simulation runs at a fixed TICK_RATE and frames interpolate between ticks.
+    # Every run is seeded so it can be recorded and replayed tick for tick.
+    seed = replay.seed if replay else random.randrange(1 << 32)
+    tick_rate = replay.tick_rate if replay else TICK_RATE
+    num_enemies = replay.num_enemies if replay else NUM_ENEMY_CARS
+    sim = Simulation(current_width, current_height, car_number=selected_car, num_enemies=num_enemies,
+                     seed=seed, tick_rate=tick_rate, load_road_image=True, profiler=profiler)
+    road, car, score = sim.road, sim.car, sim.score
 
-    road = Road(current_width, current_height)
-
-    # Create car first with temporary position
-    car = MainCar(0, 0, car_number=selected_car)
-    
-    # Now calculate proper starting position based on actual car size after initialization
-    car_start_x = (current_width - car.width) // 2
-    car_start_y = current_height - car.height
-    
-    # Set the car to the correct position
-    car.set_position(car_start_x, car_start_y)
-    NUM_ENEMY_CARS = 1
-    enemy_cars = [EnemyCar(current_width, current_height) for _ in range(NUM_ENEMY_CARS)]
+    def new_recorder():
+        """Replay log for the simulation's current run, when recording is on"""
+        if RECORD_REPLAYS and replay is None:
+            return ReplayRecorder(sim.seed, tick_rate, (sim.width, sim.height), car.car_number, num_enemies)
+        return None
+
+    recorder = new_recorder()
     clock = pygame.time.Clock()
-    score = Score()
+    frame_cap = render_frame_cap()
+    timestep = FixedTimestep(tick_rate)
+    replay_ticks = replay.ticks() if replay else None
+    dirty = DirtyRects()
+
+    def apply_resize(width, height, prepared):
+        # swapped in between ticks, which is also where a replay applies it
+        if recorder:
+            recorder.record_resize(width, height)
+        sim.resize(width, height, prepared)
+
+    # window drags are coalesced and rescaled on a worker, the old sprites
+    # are drawn stretched to the new window until the new ones are ready
+    resizer = ResizeCoordinator(sim.prepare_resize, apply_resize)
+    frame = None
 
     running = True
     paused = False
+    shown_score = score.get_score()
+    shown_box = render_score_box(shown_score)
     while running:
-        clock.tick(FPS)
+        # the pause screen never needs more than FPS, even with an uncapped RENDER_FPS
+        frame_time = clock.tick(FPS if paused else frame_cap) / 1000
+        if paused:
+            dirty.wait()  # nothing moves while paused, sleep until an event
+        profiler.begin_frame()
 
         # Handle events
-        for i in pygame.event.get():
-            if i.type == pygame.QUIT:
-                return False  # Exit game
-            elif i.type == pygame.VIDEORESIZE:
-                current_width, current_height = i.size
-                screen = pygame.display.set_mode((current_width, current_height), pygame.RESIZABLE)
-                road.set_size(current_width, current_height)
-                car.update_screen_size(current_width, current_height)  # Update car boundaries
-                for enemy_car in enemy_cars:
-                    enemy_car.update_screen_size(current_width, current_height)
-                # Update car start position for when game over occurs
-                car_start_x = (current_width - car.width) // 2
-                car_start_y = current_height - car.height
-            elif i.type == pygame.KEYDOWN:
-                # Change car model with number keys
-                if i.key == pygame.K_1:
-                    car.change_car(3)
-                elif i.key == pygame.K_2:
-                    car.change_car(4)
-                elif i.key == pygame.K_3:
-                    car.change_car(5)
-                elif i.key == pygame.K_ESCAPE:
-                    return True  # Return to main menu
-                elif i.key == pygame.K_SPACE:  
-                    paused = not paused
+        with profiler.phase("events"):
+            for i in pygame.event.get():
+                if i.type == pygame.QUIT:
+                    save_recording(recorder, sim)
+                    return leave(False)  # Exit game
+                elif i.type == pygame.VIDEORESIZE and replay is None and canvas is None:
+                    screen = pygame.display.set_mode(i.size, pygame.RESIZABLE)
+                    dirty.mark_all()
+                    resizer.request(*i.size)  # Road, car and enemy boundaries once the drag settles
+                elif i.type == pygame.WINDOWSIZECHANGED and replay is None and canvas is not None:
+                    resizer.request(i.x, i.y)  # renderer windows only report their new size
+                elif i.type == pygame.KEYDOWN:
+                    # Change car model with number keys
+                    if i.key == pygame.K_1:
+                        car.change_car(3)
+                    elif i.key == pygame.K_2:
+                        car.change_car(4)
+                    elif i.key == pygame.K_3:
+                        car.change_car(5)
+                    elif i.key == pygame.K_ESCAPE:
+                        save_recording(recorder, sim)
+                        return leave(True)  # Return to main menu
+                    elif i.key == pygame.K_F3:
+                        profiler.toggle_overlay()  # frame timing overlay
+                    elif i.key == pygame.K_SPACE:  
+                        paused = not paused
+                        if recorder:
+                            recorder.record_pause()
+                        clock.tick()  # time spent paused is not simulated
+                        timestep.reset()
                     
         if paused:
             # Display paused message
-            font = pygame.font.Font(None, 72)
-            pause_text = font.render("PAUSED", True, (255, 0, 0))
-            screen.blit(pause_text, (screen.get_width()//2 - pause_text.get_width()//2, screen.get_height()//2 - pause_text.get_height()//2))
-            pygame.display.flip()
+            pause_text = render_text("PAUSED", 72, (255, 0, 0))
+            if canvas is not None:
+                # a renderer's back buffer doesn't keep the last frame
+                canvas.begin_frame((sim.width, sim.height))
+                sim.draw(canvas, timestep.alpha)
+                screen.blit(shown_box, (20, 15))
+            pause_rect = screen.blit(pause_text, (screen.get_width()//2 - pause_text.get_width()//2, screen.get_height()//2 - pause_text.get_height()//2))
+            dirty.mark(pause_rect)
+            if canvas is not None:
+                canvas.present()
+            else:
+                dirty.present()
             continue
 
-        # Handle car input
-        keys = pygame.key.get_pressed()
-        car.handle_input(keys)
-        car.update_position()
-        
-        # Score update
-        score.update()
-        
-        # Draw everything
-        road.move()
-        road.draw(screen)
-        car.draw(screen)
-        for enemy_car in enemy_cars:
-            enemy_car.move(score.get_score())
-            enemy_car.draw(screen)
-        
-        # Draw score text
-        font = pygame.font.Font(None, 48)
-        score_text = font.render(f"Score: {score.get_score()}", True, (255, 255, 255))
+        resizer.poll()  # swap in a finished resize before this frame's ticks
+
+        # Car input, movement, score and collision for every tick due this frame
+        inputs = Inputs.from_keys(pygame.key.get_pressed())
+        hit = None
+        for _ in range(timestep.add_frame(frame_time * speed)):
+            if replay_ticks is not None:
+                # recorded input (and window size) replaces the keyboard
+                recorded = next(replay_ticks, None)
+                if recorded is None:
+                    return leave(True)  # replay finished without a crash
+                resizes, inputs = recorded
+                for current_width, current_height in resizes:
+                    set_window_size((current_width, current_height))
+                    dirty.mark_all()
+                    sim.resize(current_width, current_height)
+            hit = sim.step(inputs)
+            if recorder:
+                recorder.record_tick(inputs)
+            if hit is not None:
+                break
         
-        # Background box
-        box_rect = pygame.Rect(20, 15, score_text.get_width() + 20, score_text.get_height() + 10)
-        pygame.draw.rect(screen, (25, 25, 25), box_rect, border_radius=8)
+        # Draw everything, interpolated between the last two ticks
+        alpha = 1.0 if hit is not None else timestep.alpha
+        if canvas is not None:
+            # the renderer stretches a pending resize, nothing is drawn twice
+            canvas.begin_frame((sim.width, sim.height))
+            target = canvas
+        elif screen.get_size() == (sim.width, sim.height):
+            target = screen
+        else:
+            # resize still being prepared, draw at the old size and stretch it over the window
+            if frame is None or frame.get_size() != (sim.width, sim.height):
+                frame = pygame.Surface((sim.width, sim.height)).convert()
+            target = frame
+        # everything is queued by layer and goes out in one blits call per layer
+        render = sim.render_queue
+        render.begin(target, (sim.width, sim.height))
+        sim.submit(render, alpha)
         
-        # Draw text
-        screen.blit(score_text, (30, 20))
+        with profiler.phase("hud"):
+            # Draw score text, re-rendered only when the score changes
+            # (box and text together, so renderer canvases upload one texture per score)
+            if score.get_score() != shown_score:
+                shown_score = score.get_score()
+                shown_box = render_score_box(shown_score)
+            render.submit(shown_box, (20, 15), HUD_LAYER)
+        with profiler.phase("flush"):
+            render.flush()
+        if target is frame:
+            pygame.transform.scale(frame, screen.get_size(), screen)
+        dirty.mark_all()  # the scrolling road repaints the whole frame
+        profiler.draw_overlay(screen)
         
-        # Collision check 
-        for enemy_car in enemy_cars:
-            if check_collision(screen, car, enemy_car, draw_debug=True):
-                game_over_result = show_game_over(screen, road, car, enemy_car, car_start_x, car_start_y, score.get_score())
+        # Collision found by the simulation step
+        if hit is not None:
+            # the frame ends at the crash, time on the game over screen isn't a frame
+            profiler.end_frame()
+            # one replay log covers one run, up to its first crash
+            save_recording(recorder, sim, hit)
+            recorder = None
+            if replay is None:
+                # only queued here, the writer thread saves it
+                score_store.record(score.get_score(), car.car_number, score.elapsed())
+            if canvas is not None:
+                # the game over screen draws with the display module
+                size = canvas.get_size()
+                canvas.close()
+                screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+            game_over_result = show_game_over(screen, road, car, hit, *sim.start_position(), score.get_score(),
+                                              resizer=resizer)
 
-                if game_over_result == "retry":
-                    score.reset()
-                elif game_over_result == "menu":
-                    return True
-                else:
-                    return False
+            if game_over_result == "retry":
+                if canvas is not None:
+                    canvas = open_canvas(screen.get_size())
+                    screen = canvas or pygame.display.get_surface()
+                # a fresh seeded run in the same simulation, so its replay log reproduces it from the start
+                sim.restart(random.randrange(1 << 32))
+                recorder = new_recorder()
+                clock.tick()  # don't count the time spent on the game over screen
+                timestep.reset()
+                continue  # the next frame draws the new run
+            elif game_over_result == "menu":
+                return True
+            else:
+                return False
 
-        pygame.display.flip()
+        with profiler.phase("present"):
+            if canvas is not None:
+                canvas.present()
+            else:
+                dirty.present()
+        profiler.end_frame()
 
     return False  # Exit game
 
 def main():
     pygame.init()
+    asset_manager.start()  # decode and clean every image while the menu is up
+    score_store.start()  # scores load and save on a writer thread from here on
+    if PROFILE_TRACE:
+        # keep every frame and write them out however the game exits
+        profiler.trace = True
+        profiler.watch_gc()
+        atexit.register(profiler.dump, PROFILE_TRACE)
     last_car = 3
     while True:
         # Show main menu and get selected car
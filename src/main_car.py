@@ -1,17 +1,28 @@
 import pygame
-import os
-from config import WIDTH, HEIGHT
+from config import WIDTH, HEIGHT, TICK_RATE
+from car import Car
+from sprite_cleaner import SPRITE_BLEND
+from inputs import Inputs
+from timestep import lerp
+from render_queue import CAR_LAYER
 
-class MainCar:
+class MainCar(Car):
     """Main player car class with image loading and movement controls"""
+
+    __slots__ = ("x", "y", "prev_x", "prev_y", "car_number", "speed")
+    fallback_color = (255, 0, 0)  # Red color as fallback for debugging
     
-    def __init__(self, x, y, car_number=3):
-        self.x, self.y, self.car_number, self.speed = x, y, car_number, 5
-        self.screen_width = pygame.display.get_surface().get_width() if pygame.display.get_surface() else WIDTH
-        self.screen_height = pygame.display.get_surface().get_height() if pygame.display.get_surface() else HEIGHT
+    def __init__(self, x, y, car_number=3, screen_size=None):
+        self.x, self.y, self.car_number = x, y, car_number
+        self.speed = 300  # px per second
+        self.prev_x, self.prev_y = x, y  # position at the previous tick, for interpolation
+        if not screen_size:
+            # Headless runs pass the size instead of asking the display
+            surface = pygame.display.get_surface()
+            screen_size = surface.get_size() if surface else (WIDTH, HEIGHT)
 
         # Calculate responsive road boundaries based on screen width
-        self.update_road_boundaries()
+        self.update_road_boundaries(*screen_size)
         
         # Load car image
         self.load_car_image()
@@ -19,54 +30,6 @@ class MainCar:
         # Create collision rectangle
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
 
-    def update_road_boundaries(self):
-        self.road_left_border = self.road_right_border = int(self.screen_width * 0.1)
-
-    def _car_size(self):
-        road_w = self.screen_width - 2 * int(self.screen_width * 0.1)
-        w = max(60, min(int(road_w * 0.25), 250))
-        return w, int(w * 1.3)
-
-    def load_car_image(self):
-        try:
-            # Get the path to the assets folder
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            assets_path = os.path.join(current_dir, "assets", f"car{self.car_number}.png")
-            
-            # Load the original image
-            original = pygame.image.load(assets_path).convert_alpha()
-                        
-            # Try multiple methods to remove background
-            # Method 1: Aggressive pixel-by-pixel removal
-            cleaned_surface = pygame.Surface(original.get_size(), pygame.SRCALPHA)
-            cleaned_surface.fill((0, 0, 0, 0))  # Fill with transparent
-            for x in range(original.get_width()):
-                for y in range(original.get_height()):
-                    pixel = original.get_at((x, y))
-                    r, g, b, a = pixel[0], pixel[1], pixel[2], pixel[3] if len(pixel) > 3 else 255
-                    # Multiple conditions to detect background
-                    is_background = False
-                    # Pure white or Near white (very light colors)
-                    if r > 240 and g > 240 and b > 240:
-                        is_background = True
-                    # Light gray/off-white
-                    elif r > 220 and g > 220 and b > 220 and abs(r-g) < 20 and abs(g-b) < 20:
-                        is_background = True
-                    # Already transparent
-                    elif a < 10:
-                        is_background = True
-                    
-                    if not is_background:
-                        cleaned_surface.set_at((x, y), pixel)
-            car_width, car_height = self._car_size()
-            self.image = pygame.transform.scale(cleaned_surface, (car_width, car_height))
-            self.width, self.height = car_width, car_height
-        except Exception as e:
-            # Create a fallback rectangle if image loading fails
-            self.width, self.height = 60, 100
-            self.image = None
-            self.fallback_color = (255, 0, 0)  # Red color as fallback for debugging
-    
     # @staticmethod          check later
     # def get_default_car_height():
     #     """Get default car height for initial positioning"""
@@ -94,43 +57,38 @@ class MainCar:
     #     road_width = screen_width - (2 * int(screen_width * 0.1))
     #     return max(60, min(int(road_width * 0.25), 200))
 
-    def move_left(self):
+    def move_left(self, dt=1 / TICK_RATE):
         """Move car left with road boundary checking"""
         # Road has borders, so we need to stay within the road area
-        if self.x > self.road_left_border:
-            self.x -= self.speed
-            self.rect.x = self.x
+        if self.x > self.geometry.left:
+            self.x -= self.speed * dt
+            self.rect.x = int(self.x)
 
-    def move_right(self):
+    def move_right(self, dt=1 / TICK_RATE):
         """Move car right with road boundary checking"""
         # Road has borders, so we need to stay within the road area
-        if self.x < self.screen_width - self.width - self.road_right_border:
-            self.x += self.speed
-            self.rect.x = self.x
+        if self.x < self.geometry.right - self.width:
+            self.x += self.speed * dt
+            self.rect.x = int(self.x)
 
-    def move_up(self):
+    def move_up(self, dt=1 / TICK_RATE):
         """Move car up with boundary checking"""
         if self.y > 0:
-            self.y -= self.speed
-            self.rect.y = self.y
+            self.y -= self.speed * dt
+            self.rect.y = int(self.y)
 
-    def move_down(self):
+    def move_down(self, dt=1 / TICK_RATE):
         """Move car down with boundary checking"""
-        if self.y < self.screen_height - self.height:
-            self.y += self.speed
-            self.rect.y = self.y
+        if self.y < self.geometry.height - self.height:
+            self.y += self.speed * dt
+            self.rect.y = int(self.y)
     
     def update_screen_size(self, width, height):
         """Updating screen dimensions when window is resized"""
-        old_width, old_height = self.screen_width, self.screen_height
-        old_road_width = old_width - (2 * int(old_width * 0.1))
-        car_center_x = self.x + getattr(self, 'width', 60) // 2
-        old_left_border = int(old_width * 0.1)
-        x_ratio_in_road = (car_center_x - old_left_border) / old_road_width if old_road_width > 0 else 0.5
-        old_car_height = getattr(self, 'height', 100)
+        x_ratio_in_road = self.geometry.fraction(self.x + self.width // 2)
         
         # Calculate available space for car movement (screen height - car height)
-        old_available_space = old_height - old_car_height
+        old_available_space = self.geometry.height - self.height
         
         if old_available_space > 0:
             # Calculate ratio where 0.0 = top, 1.0 = bottom
@@ -140,73 +98,71 @@ class MainCar:
         
         # Clamp the ratio to valid range
         y_ratio = max(0.0, min(1.0, y_ratio))
-        self.screen_width, self.screen_height = width, height
-        # Recalculate road boundaries for new screen size
-        self.update_road_boundaries()
-        # Reload car image with new responsive size
-        self.load_car_image()
+        # Recalculate road boundaries and car size for new screen size
+        self.resize_car(width, height)
         self.rect.size = (self.width, self.height)
-        # Calculate new horizontal position within the new road area
-        new_road_width = self.screen_width - (2 * self.road_left_border)
-        new_center_x = self.road_left_border + (x_ratio_in_road * new_road_width)
-        self.x = int(new_center_x - self.width // 2)
+        # Same place across the new road, kept on it (centered if the road is too narrow)
+        self.x = self.geometry.clamp_x(int(self.geometry.at(x_ratio_in_road) - self.width // 2), self.width)
         # Calculate new vertical position using ratio
-        new_available_space = self.screen_height - self.height
+        new_available_space = height - self.height
         self.y = int(y_ratio * new_available_space) if new_available_space > 0 else 0
-        # Ensure car stays within valid boundaries
-        min_x = self.road_left_border
-        max_x = self.screen_width - self.road_right_border - self.width
-        
-        if max_x >= min_x:  # Valid road area exists
-            if self.x < min_x:
-                self.x = min_x
-            elif self.x > max_x:
-                self.x = max_x
-        else:  # Road too narrow, center horizontally
-            self.x = (self.screen_width - self.width) // 2
         
         # Check vertical boundaries
         if self.y < 0:
             self.y = 0
-        elif self.y + self.height > self.screen_height:
-            self.y = self.screen_height - self.height
+        elif self.y + self.height > height:
+            self.y = height - self.height
             
         self.update_position()
+        self.prev_x, self.prev_y = self.x, self.y
         
         # print(f"Screen resized from {old_width}x{old_height} to {width}x{height}")
         # print(f"Car positioned at ({self.x}, {self.y}), y-ratio: {y_ratio:.3f}")
     
     def handle_input(self, keys):
         """Handle keyboard input for car movement"""
-        # Check for key presses and move accordingly
-        if keys[pygame.K_LEFT] or keys[pygame.K_a] or keys[pygame.K_KP_4]:self.move_left()
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d] or keys[pygame.K_KP_6]:self.move_right()
-        if keys[pygame.K_UP] or keys[pygame.K_w] or keys[pygame.K_KP_8]:self.move_up()
-        if keys[pygame.K_DOWN] or keys[pygame.K_s] or keys[pygame.K_KP_2]:self.move_down()
+        self.steer(Inputs.from_keys(keys))
+
+    def steer(self, inputs, dt=1 / TICK_RATE):
+        """Move the car for one tick from an Inputs tuple (live keys, replays or headless runs)"""
+        self.prev_x, self.prev_y = self.x, self.y
+        if inputs.left: self.move_left(dt)
+        if inputs.right: self.move_right(dt)
+        if inputs.up: self.move_up(dt)
+        if inputs.down: self.move_down(dt)
 
     def update_position(self):
         """Update the collision rectangle position"""
-        self.rect.x = self.x
-        self.rect.y = self.y
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
     
-    def draw(self, screen):
-        """Draw the car on the screen"""
+    def draw(self, screen, alpha=1.0):
+        """Draw the car on the screen, alpha interpolates between the last two ticks"""
+        x, y = lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
         if self.image:
             # Draw the car image
-            screen.blit(self.image, (self.x, self.y))
+            screen.blit(self.image, (x, y), special_flags=SPRITE_BLEND)
         else:
             # Fallback: draw a colored rectangle if image failed to load
-            pygame.draw.rect(screen, self.fallback_color, self.rect)
+            pygame.draw.rect(screen, self.fallback_color, (x, y, self.width, self.height))
             
             # Add some basic car details for fallback
             # Windshield
-            windshield_rect = pygame.Rect(self.x + 15, self.y + 15, self.width - 30, 30)
+            windshield_rect = pygame.Rect(x + 15, y + 15, self.width - 30, 30)
             pygame.draw.rect(screen, (173, 216, 230), windshield_rect)
             
             # Headlights
-            pygame.draw.circle(screen, (255, 255, 255), (self.x + 20, self.y + 10), 5)
-            pygame.draw.circle(screen, (255, 255, 255), (self.x + self.width - 20, self.y + 10), 5)
+            pygame.draw.circle(screen, (255, 255, 255), (x + 20, y + 10), 5)
+            pygame.draw.circle(screen, (255, 255, 255), (x + self.width - 20, y + 10), 5)
     
+    def submit(self, queue, alpha=1.0):
+        """Queue the car on the CAR_LAYER, interpolated like draw()"""
+        if self.image:
+            queue.submit(self.image, (lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)),
+                         CAR_LAYER, SPRITE_BLEND)
+        else:
+            queue.call(lambda target: self.draw(target, alpha), CAR_LAYER)
+
     def get_rect(self):
         """Return the collision rectangle"""
         return self.rect
@@ -218,6 +174,7 @@ class MainCar:
     def set_position(self, x, y):
         """Set the car position"""
         self.x, self.y = x, y
+        self.prev_x, self.prev_y = x, y
         self.update_position()
 
     # def change_car(self, car_number):
@@ -0,0 +1,192 @@
+import csv
+import gc
+import json
+import sys
+import time
+from collections import deque
+from contextlib import nullcontext
+import numpy as np
+import pygame
+from text_cache import get_font
+
+
+class _Phase:
+    """Context manager adding its elapsed time to one phase of the current frame"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler, self.name = profiler, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        frame = self.profiler.current
+        frame[self.name] = frame.get(self.name, 0.0) + elapsed
+
+
+class FrameProfiler:
+    """Per-phase frame timing with rolling percentiles, an overlay and trace dumps.
+
+    Wrap each part of the loop in `with profiler.phase("name"):` between
+    begin_frame() and end_frame(). The last `window` frames feed the
+    p50/p95/p99/max shown in the overlay; every frame (up to max_trace) is
+    kept for dump() when tracing is on.
+
+    Every frame also reports "#blocks", the net number of memory blocks
+    the interpreter allocated from its begin_frame() to the next one, after
+    the profiler's own record of it is let go. Steady-state gameplay sits
+    at 0; anything that keeps allocating per frame shows up there (while
+    tracing, the trace keeps each record, about 10 blocks a frame).
+    count() adds to other per-frame counters ("#" names) reported next to
+    the phases; counts outside a frame are dropped.
+    While the overlay or tracing is on (watch_gc()), garbage collections
+    are counted ("#gc") and timed ("gc") as well.
+    """
+
+    def __init__(self, window=600, trace=False, max_trace=100_000):
+        self.window = window
+        self.trace = trace
+        self.max_trace = max_trace
+        self.history = {}  # phase -> deque of ms
+        self.frames = []
+        self.current = {}
+        self.frame_start = None
+        self.blocks_start = None
+        self._traced = None
+        self.frame_count = 0
+        self.show_overlay = False
+        self._overlay = None
+        self._overlay_frame = -1
+        self._gc_start = None
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def count(self, name, n=1):
+        """Add n to a per-frame counter, name should start with "#" """
+        if self.frame_start is not None:
+            self.current[name] = self.current.get(name, 0) + n
+
+    def watch_gc(self, on=True):
+        """Record garbage collections in the frames they happen in"""
+        if on and self._gc not in gc.callbacks:
+            gc.callbacks.append(self._gc)
+        elif not on and self._gc in gc.callbacks:
+            gc.callbacks.remove(self._gc)
+
+    def _gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.count("#gc")
+            self.count("gc", (time.perf_counter() - self._gc_start) * 1000)
+            self._gc_start = None
+
+    def begin_frame(self):
+        self.current = None  # so the last frame's record isn't counted against it
+        blocks = sys.getallocatedblocks()
+        if self.frame_start is None and self.blocks_start is not None:
+            self._add("#blocks", blocks - self.blocks_start)
+            if self._traced is not None:
+                self._traced["#blocks"] = blocks - self.blocks_start
+        self.blocks_start = blocks
+        self._traced = None
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        self.current["frame"] = (time.perf_counter() - self.frame_start) * 1000
+        for name, ms in self.current.items():
+            self._add(name, ms)
+        if self.trace and len(self.frames) < self.max_trace:
+            self.frames.append(self.current)
+            self._traced = self.current
+        self.frame_count += 1
+        self.frame_start = None
+
+    def _add(self, name, value):
+        samples = self.history.get(name)
+        if samples is None:
+            samples = self.history[name] = deque(maxlen=self.window)
+        samples.append(value)
+
+    def stats(self, name):
+        """p50/p95/p99/max in ms over the rolling window"""
+        samples = self.history.get(name)
+        if not samples:
+            return None
+        p50, p95, p99 = np.percentile(np.fromiter(samples, float), (50, 95, 99))
+        return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": max(samples)}
+
+    def summary(self):
+        return {name: self.stats(name) for name in self.history}
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self.watch_gc(self.show_overlay or self.trace)
+
+    def draw_overlay(self, screen, x=10, y=80):
+        """Draw the per-phase table; the text is rebuilt twice a second"""
+        if not self.show_overlay:
+            return None
+        if self._overlay is None or self.frame_count - self._overlay_frame >= 30:
+            self._overlay = self._render_overlay()
+            self._overlay_frame = self.frame_count
+        return screen.blit(self._overlay, (x, y))
+
+    def _render_overlay(self):
+        font = get_font(22)
+        rows = [("phase (ms, #)", "p50", "p95", "p99", "max")]
+        for name in sorted(self.history, key=lambda n: (n != "frame", n)):
+            s = self.stats(name)
+            rows.append((name,) + tuple(f"{s[key]:.2f}" for key in ("p50", "p95", "p99", "max")))
+        name_w, col_w, line_h = 110, 56, font.get_linesize()
+        overlay = pygame.Surface((name_w + 4 * col_w + 12, line_h * len(rows) + 8), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        for i, row in enumerate(rows):
+            color = (255, 255, 255) if i == 0 else (255, 255, 0)
+            top = 4 + i * line_h
+            overlay.blit(font.render(row[0], True, (255, 255, 255)), (6, top))
+            for col, cell in enumerate(row[1:]):
+                text = font.render(cell, True, color)
+                # right align the numbers in their column
+                overlay.blit(text, (6 + name_w + (col + 1) * col_w - text.get_width(), top))
+        return overlay
+
+    def dump(self, path):
+        """Write the per-frame trace as JSON or CSV (picked from the extension)"""
+        if path.endswith(".csv"):
+            columns = sorted({name for frame in self.frames for name in frame})
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=["index"] + columns)
+                writer.writeheader()
+                for i, frame in enumerate(self.frames):
+                    writer.writerow({"index": i, **{k: round(v, 4) for k, v in frame.items()}})
+        else:
+            with open(path, "w") as f:
+                json.dump({"summary": self.summary(), "frames": self.frames}, f)
+
+
+class NullProfiler:
+    """Stand-in used by headless runs that don't want any timing overhead"""
+
+    def phase(self, name):
+        return nullcontext()
+
+    def count(self, name, n=1):
+        pass
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+profiler = FrameProfiler()
@@ -0,0 +1,77 @@
+ROAD_LAYER, CAR_LAYER, HUD_LAYER = range(3)
+LAYER_COUNT = 3
+
+
+class RenderQueue:
+    """Per-frame list of draw commands, flushed in layer order.
+
+    Drawables submit (surface, position, layer) instead of blitting. Commands
+    entirely outside the frame are dropped at submit, and flush() hands each
+    layer to the target in a single Surface.blits call, so a frame costs a
+    few calls into pygame however many sprites are on screen. Drawing that
+    isn't a plain blit (fallback rects, a renderer stretching the road) goes
+    in as a call, run in its place in the layer.
+
+    Works with any target that has blits(): display surfaces, offscreen
+    frames and the SDL2 TextureCanvas.
+    """
+
+    def __init__(self):
+        self.layers = [[] for _ in range(LAYER_COUNT)]  # reused every frame
+        self.has_calls = [False] * LAYER_COUNT
+        self.target = None
+        self.width = self.height = 0
+        self.submitted = self.culled = self.batches = 0  # counts for the last frame
+
+    def begin(self, target, size=None):
+        """Start a frame for target, culling against size (the target's size by default)"""
+        self.target = target
+        self.width, self.height = size or target.get_size()
+        for commands in self.layers:
+            commands.clear()
+        self.has_calls = [False] * LAYER_COUNT
+        self.submitted = self.culled = self.batches = 0
+
+    def submit(self, surface, pos, layer, special_flags=0):
+        x, y = pos
+        width, height = surface.get_size()
+        if x >= self.width or y >= self.height or x + width <= 0 or y + height <= 0:
+            self.culled += 1
+            return
+        self.layers[layer].append((surface, pos, None, special_flags))
+        self.submitted += 1
+
+    def submit_many(self, surface, positions, layer, special_flags=0):
+        """Same surface at many positions the caller already culled"""
+        commands = [(surface, pos, None, special_flags) for pos in positions]
+        self.layers[layer].extend(commands)
+        self.submitted += len(commands)
+
+    def call(self, draw, layer):
+        """Run draw(target) at this point of the layer"""
+        self.layers[layer].append(draw)
+        self.has_calls[layer] = True
+
+    def flush(self):
+        target = self.target
+        for commands, has_calls in zip(self.layers, self.has_calls):
+            if not has_calls:
+                if commands:
+                    target.blits(commands, doreturn=False)
+                    self.batches += 1
+                    commands.clear()
+                continue
+            batch = []
+            for command in commands:
+                if isinstance(command, tuple):
+                    batch.append(command)
+                    continue
+                if batch:
+                    target.blits(batch, doreturn=False)
+                    self.batches += 1
+                    batch = []
+                command(target)
+            if batch:
+                target.blits(batch, doreturn=False)
+                self.batches += 1
+            commands.clear()
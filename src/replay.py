@@ -0,0 +1,187 @@
+"""Deterministic input recording and replay.
+
+A replay log holds the RNG seed and setup of a run, then the per-tick input
+state (run-length encoded, one bit per direction) with resize and pause
+events in between, and finally the tick and score the run ended on. Because
+the simulation runs on a fixed timestep and all randomness comes from the
+seed, feeding the log back reproduces the same collision tick and score.
+
+Usage:
+    python src/replay.py run.replay              # headless, as fast as possible
+    python src/replay.py run.replay --watch 4    # through start_game at 4x speed
+"""
+import argparse
+import os
+import struct
+import time
+from inputs import Inputs
+
+MAGIC = b"CARR"
+VERSION = 2  # 2: enemies spawn in lanes, older runs no longer replay the same
+HEADER = struct.Struct("<4sBQHHHBH")  # magic, version, seed, tick rate, width, height, car, enemies
+RUN = struct.Struct("<BH")           # input bits, tick count
+RESIZE = struct.Struct("<HH")
+FOOTER = struct.Struct("<iI")         # collision tick (-1 for none), final score
+
+OP_INPUT, OP_RESIZE, OP_PAUSE, OP_END = 0x00, 0x10, 0x20, 0xFF
+MAX_RUN = 0xFFFF
+
+
+def encode_inputs(inputs):
+    return inputs.left | inputs.right << 1 | inputs.up << 2 | inputs.down << 3
+
+
+def decode_inputs(bits):
+    return Inputs(bool(bits & 1), bool(bits & 2), bool(bits & 4), bool(bits & 8))
+
+
+class Replay:
+    """A recorded run: setup, ordered events and the recorded outcome"""
+
+    def __init__(self, seed, tick_rate, size, car_number, num_enemies):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.size = tuple(size)
+        self.car_number = car_number
+        self.num_enemies = num_enemies
+        self.events = []  # ("input", bits, count) | ("resize", w, h) | ("pause",)
+        self.collision_tick = None
+        self.final_score = None
+
+    def ticks(self):
+        """Yield (resizes before this tick, Inputs) for every recorded tick"""
+        resizes = []
+        for event in self.events:
+            if event[0] == "resize":
+                resizes.append(event[1:])
+            elif event[0] == "input":
+                inputs = decode_inputs(event[1])
+                for _ in range(event[2]):
+                    yield resizes, inputs
+                    resizes = []
+
+    def save(self, path):
+        parts = [HEADER.pack(MAGIC, VERSION, self.seed, self.tick_rate, self.size[0], self.size[1],
+                             self.car_number, self.num_enemies)]
+        for event in self.events:
+            if event[0] == "input":
+                parts.append(bytes((OP_INPUT,)) + RUN.pack(event[1], event[2]))
+            elif event[0] == "resize":
+                parts.append(bytes((OP_RESIZE,)) + RESIZE.pack(event[1], event[2]))
+            else:
+                parts.append(bytes((OP_PAUSE,)))
+        tick = -1 if self.collision_tick is None else self.collision_tick
+        parts.append(bytes((OP_END,)) + FOOTER.pack(tick, self.final_score or 0))
+        with open(path, "wb") as f:
+            f.write(b"".join(parts))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, tick_rate, width, height, car_number, num_enemies = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        replay = cls(seed, tick_rate, (width, height), car_number, num_enemies)
+        pos = HEADER.size
+        while pos < len(data):
+            op = data[pos]
+            pos += 1
+            if op == OP_INPUT:
+                bits, count = RUN.unpack_from(data, pos)
+                replay.events.append(("input", bits, count))
+                pos += RUN.size
+            elif op == OP_RESIZE:
+                replay.events.append(("resize",) + RESIZE.unpack_from(data, pos))
+                pos += RESIZE.size
+            elif op == OP_PAUSE:
+                replay.events.append(("pause",))
+            elif op == OP_END:
+                tick, score = FOOTER.unpack_from(data, pos)
+                replay.collision_tick = None if tick < 0 else tick
+                replay.final_score = score
+                break
+            else:
+                raise ValueError(f"bad replay opcode {op:#x} at byte {pos - 1}")
+        return replay
+
+
+class ReplayRecorder:
+    """Builds a Replay tick by tick while a game is played"""
+
+    def __init__(self, seed, tick_rate, size, car_number, num_enemies):
+        self.replay = Replay(seed, tick_rate, size, car_number, num_enemies)
+
+    def record_tick(self, inputs):
+        bits = encode_inputs(inputs)
+        events = self.replay.events
+        last = events[-1] if events else None
+        if last and last[0] == "input" and last[1] == bits and last[2] < MAX_RUN:
+            events[-1] = ("input", bits, last[2] + 1)
+        else:
+            events.append(("input", bits, 1))
+
+    def record_resize(self, width, height):
+        self.replay.events.append(("resize", width, height))
+
+    def record_pause(self):
+        self.replay.events.append(("pause",))
+
+    def finish(self, collision_tick, final_score):
+        self.replay.collision_tick = collision_tick
+        self.replay.final_score = final_score
+
+    def save(self, directory):
+        """Write the log into directory under a timestamped name and return its path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime("run-%Y%m%d-%H%M%S") + f"-{self.replay.seed}.replay")
+        self.replay.save(path)
+        return path
+
+
+def run_headless(replay, **sim_options):
+    """Play a replay through a display-less Simulation.
+
+    Returns (collision tick or None, final score, ticks run).
+    """
+    from simulation import Simulation
+
+    sim = Simulation(replay.size[0], replay.size[1], car_number=replay.car_number,
+                     num_enemies=replay.num_enemies, seed=replay.seed, tick_rate=replay.tick_rate,
+                     **sim_options)
+    for resizes, inputs in replay.ticks():
+        for width, height in resizes:
+            sim.resize(width, height)
+        if sim.step(inputs) is not None:
+            return sim.ticks, sim.score.get_score(), sim.ticks
+    return None, sim.score.get_score(), sim.ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded 2D Car Game run")
+    parser.add_argument("path")
+    parser.add_argument("--watch", type=float, metavar="SPEED",
+                        help="show the replay in a window at SPEED x real time")
+    args = parser.parse_args()
+    replay = Replay.load(args.path)
+
+    if args.watch:
+        import pygame
+        from main import start_game
+
+        pygame.init()
+        start_game(replay.car_number, replay=replay, speed=args.watch)
+        pygame.quit()
+        return
+
+    start = time.perf_counter()
+    tick, score, ticks = run_headless(replay)
+    elapsed = time.perf_counter() - start
+    print(f"collision tick: {tick}  score: {score}  ({ticks} ticks in {elapsed:.3f}s)")
+    print(f"recorded:       {replay.collision_tick}  score: {replay.final_score}")
+    if (tick, score) != (replay.collision_tick, replay.final_score):
+        raise SystemExit("replay diverged from the recording")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from config import RESIZE_DEBOUNCE
+from dirty_rects import wake
+
+# posted to wake event-waiting loops when a debounced resize is due or ready
+RESIZE_READY = pygame.event.custom_type()
+
+_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resize")
+
+
+class ResizeCoordinator:
+    """Coalesces window resize bursts and rebuilds assets off the main thread.
+
+    request() only records the latest size. Once no new size has arrived for
+    `delay` seconds, prepare(width, height) runs on the worker thread and
+    must not touch live game state. When it finishes, the next poll() on the
+    main thread hands its result to apply(width, height, prepared), which
+    swaps everything in at once. A size superseded while its job was running
+    is dropped; its sprites still end up in the cache.
+    """
+
+    def __init__(self, prepare, apply, delay=RESIZE_DEBOUNCE, executor=_worker, clock=time.monotonic):
+        self.prepare = prepare
+        self.apply = apply
+        self.delay = delay
+        self.executor = executor
+        self.clock = clock
+        self.pending = None  # latest requested size, waiting out the debounce
+        self.requested_at = 0.0
+        self.job = None  # (size, future) being prepared
+
+    def request(self, width, height):
+        self.pending = (width, height)
+        self.requested_at = self.clock()
+        if pygame.display.get_init():
+            pygame.time.set_timer(RESIZE_READY, max(1, int(self.delay * 1000)), 1)
+
+    @property
+    def busy(self):
+        return self.pending is not None or self.job is not None
+
+    def poll(self):
+        """Start a due job or apply a finished one; True when a new size was applied"""
+        if self.job is not None:
+            size, future = self.job
+            if not future.done():
+                return False
+            self.job = None
+            if self.pending is None:
+                try:
+                    prepared = future.result()
+                except Exception:
+                    prepared = None  # apply() falls back to building on the main thread
+                self.apply(*size, prepared)
+                return True
+        if self.pending is not None and self.clock() - self.requested_at >= self.delay:
+            size, self.pending = self.pending, None
+            future = self.executor.submit(self.prepare, *size)
+            future.add_done_callback(lambda future: wake(RESIZE_READY))
+            self.job = (size, future)
+        return False
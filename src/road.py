@@ -1,44 +1,75 @@
 import pygame
-import os
-from config import HEIGHT, WIDTH
+from asset_manager import asset_manager
+from config import HEIGHT, WIDTH, TICK_RATE
+from road_geometry import road_geometry
+from render_queue import ROAD_LAYER
+from timestep import lerp
 
 class Road:
-    def __init__(self, width , height):
-        # Get the correct path to the assets folder
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        assets_path = os.path.join(current_dir, "assets", "road1.png")
-        self.original_image = pygame.image.load(assets_path)
+    def __init__(self, width , height, load_image=True):
+        # decoded in the background since startup; headless simulations only need the scroll offsets
+        self.original_image = asset_manager.image("road1.png") if load_image else None
         self.set_size(width, height)
-        self.y1 = 0
-        self.y2 = -height
-        self.speed = 7 # 7 ppf
+        self.speed = 420 # px per second
         
-    def set_size(self, width , height):
+    def scaled_image(self, width, height):
+        """Road image for a window size (only reads the original, fine on a worker thread)"""
+        return pygame.transform.scale(self.original_image, (width, height)) if self.original_image else None
+
+    def set_size(self, width , height, image=None):
         self.width  = width
         self.height = height
-        self.image = pygame.transform.scale(self.original_image, (width, height)) 
+        self.geometry = road_geometry(width, height)
+        # scaled lazily on the first blit draw, renderer targets stretch the original instead
+        self.image = image
+        self.reset()
+
+    def reset(self):
+        """Scroll back to the start"""
         self.y1 = 0
-        self.y2 = -height
+        self.y2 = -self.height
+        self.prev_y1, self.prev_y2 = self.y1, self.y2
     
     def get_road_borders(self):
-        # Calculate responsive road borders based on screen width
-        border_percentage = 0.1  # 10% of screen width for borders
-        border_size = int(self.width * border_percentage)
-        # Ensure minimum and maximum border sizes
-        border_size = max(30, min(border_size, 80))
-        return border_size
+        # same borders the cars are kept inside
+        return self.geometry.border
 
-    def move(self):
-        self.y1 += self.speed
-        self.y2 += self.speed
+    def move(self, dt=1 / TICK_RATE):
+        self.prev_y1, self.prev_y2 = self.y1, self.y2
+        self.y1 += self.speed * dt
+        self.y2 += self.speed * dt
         
+        # wrap by two heights so the copies stay exactly stacked
         if self.y1 >= self.height:
-            self.y1 = -self.height
+            self.y1 -= 2 * self.height
         if self.y2 >= self.height:
-            self.y2 = -self.height
+            self.y2 -= 2 * self.height
             
+    def _lerp(self, prev, cur, alpha):
+        if cur < prev:  # wrapped during the last tick
+            prev -= 2 * self.height
+        return lerp(prev, cur, alpha)
             
-    def draw(self, screen): 
-        screen.blit(self.image, (0, self.y1))
-        screen.blit(self.image, (0, self.y2))
+    def draw(self, screen, alpha=1.0): 
+        y1 = self._lerp(self.prev_y1, self.y1, alpha)
+        y2 = self._lerp(self.prev_y2, self.y2, alpha)
+        if hasattr(screen, "draw_scaled"):
+            # the tileable strip stays one texture, scrolling only moves where it is drawn
+            screen.draw_scaled(self.original_image, (0, y1, self.width, self.height))
+            screen.draw_scaled(self.original_image, (0, y2, self.width, self.height))
+            return
+        if self.image is None:
+            self.image = self.scaled_image(self.width, self.height)
+        screen.blit(self.image, (0, y1))
+        screen.blit(self.image, (0, y2))
+
+    def submit(self, queue, alpha=1.0):
+        """Queue this frame's road copies on the ROAD_LAYER"""
+        if hasattr(queue.target, "draw_scaled"):
+            queue.call(lambda target: self.draw(target, alpha), ROAD_LAYER)  # stretched by the renderer
+            return
+        if self.image is None:
+            self.image = self.scaled_image(self.width, self.height)
+        queue.submit(self.image, (0, self._lerp(self.prev_y1, self.y1, alpha)), ROAD_LAYER)
+        queue.submit(self.image, (0, self._lerp(self.prev_y2, self.y2, alpha)), ROAD_LAYER)
         
\ No newline at end of file
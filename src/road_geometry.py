@@ -0,0 +1,61 @@
+from functools import lru_cache
+
+BORDER_FRACTION = 0.1  # each side's border, as a fraction of the window width
+CAR_WIDTH_FRACTION = 0.25  # car width, as a fraction of the road width
+MIN_CAR_WIDTH, MAX_CAR_WIDTH = 60, 250
+CAR_SIZE_STEP = 8  # car widths snap to this, so nearby window sizes share a car size and sprite
+
+
+class RoadGeometry:
+    """Road layout for one window size: borders, lanes and car size.
+
+    Every class that needs to know where the road is reads it from here,
+    so the road, the player and the traffic always agree. Get instances
+    through road_geometry(), which builds each size once.
+    """
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        # the road art is stretched to the window, so its borders scale with it
+        self.border = int(width * BORDER_FRACTION)
+        self.left, self.right = self.border, width - self.border
+        self.road_width = self.right - self.left
+
+        car_width = int(self.road_width * CAR_WIDTH_FRACTION) // CAR_SIZE_STEP * CAR_SIZE_STEP
+        self.car_width = max(MIN_CAR_WIDTH, min(car_width, MAX_CAR_WIDTH))
+        self.car_height = int(self.car_width * 1.3)
+
+        self.lane_count = max(1, self.road_width // self.car_width)
+        self.lane_width = self.road_width / self.lane_count
+        self.lane_centers = tuple(int(self.left + (lane + 0.5) * self.lane_width) for lane in range(self.lane_count))
+
+    @property
+    def car_size(self):
+        return self.car_width, self.car_height
+
+    def lane_x(self, lane, car_width=None):
+        """Left edge of a car centered in a lane"""
+        car_width = self.car_width if car_width is None else car_width
+        return self.clamp_x(self.lane_centers[lane] - car_width // 2, car_width)
+
+    def clamp_x(self, x, car_width=None):
+        """x moved inside the road for a car of car_width (centered if the road is narrower)"""
+        car_width = self.car_width if car_width is None else car_width
+        high = self.right - car_width
+        if high < self.left:
+            return (self.width - car_width) // 2
+        return max(self.left, min(x, high))
+
+    def fraction(self, x):
+        """How far across the road x is, 0 at the left border and 1 at the right one"""
+        return (x - self.left) / self.road_width if self.road_width > 0 else 0.5
+
+    def at(self, fraction):
+        """x at a fraction of the way across the road"""
+        return self.left + fraction * self.road_width
+
+
+@lru_cache(maxsize=16)
+def road_geometry(width, height):
+    """Shared RoadGeometry for a window size"""
+    return RoadGeometry(width, height)
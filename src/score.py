@@ -1,17 +1,23 @@
 import time
 
 class Score:
-    def __init__(self):
+    def __init__(self, clock=time.time):
+        # clock returns seconds; simulations pass their own tick clock
+        self.clock = clock
         self.reset()
 
     def reset(self):
-        self.start_time = time.time()
+        self.start_time = self.clock()
         self.score = 0
 
     def update(self):
-        self.score = int(time.time() - self.start_time)
+        self.score = int(self.clock() - self.start_time)
 
     def get_score(self):
         return self.score
+
+    def elapsed(self):
+        """Seconds since the run started"""
+        return self.clock() - self.start_time
     
     
\ No newline at end of file
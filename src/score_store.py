@@ -0,0 +1,242 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+import pygame
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCORES_PATH = os.path.join(ROOT_DIR, "scores.db")
+LEGACY_PATH = os.path.join(ROOT_DIR, "highscore.txt")  # single integer file of older versions
+TOP_N = 10
+WRITE_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    car INTEGER,
+    duration REAL,
+    played_at REAL NOT NULL,
+    ranked INTEGER NOT NULL DEFAULT 1  -- 0 once a reset took the run off the leaderboard
+);
+CREATE INDEX IF NOT EXISTS runs_leaderboard ON runs (score DESC, played_at) WHERE ranked;
+"""
+
+# posted when the writer thread re-read the leaderboard, so idle screens can redraw it
+SCORES_LOADED = pygame.event.custom_type()
+
+
+def insert_ranked(leaders, run, limit):
+    """Insert a (score, ...) run into a best-first list capped at limit"""
+    # ties keep the earlier run ahead like the index does
+    index = next((i for i, other in enumerate(leaders) if run[0] > other[0]), len(leaders))
+    if index < limit:
+        leaders.insert(index, run)
+        del leaders[limit:]
+
+
+class ScoreStore:
+    """Every finished run (score, car, duration, time) in a SQLite database.
+
+    Writes are transactions, so a crash never leaves a half written
+    file, and WAL mode lets several game instances append to the
+    same database without clobbering each other. The leaderboard is served
+    from an in-memory top-N that is kept up to date on our own writes and
+    re-read through the partial index only when another instance has
+    committed since (PRAGMA data_version). Reset takes runs off the
+    leaderboard but keeps them in the history.
+
+    After start(), a writer thread owns the disk: record() and reset only
+    update the cache and queue the write, and the thread commits whatever
+    has queued up as one fsynced transaction. Reads never wait on it.
+    Without start() (tools, headless runs) writes happen synchronously.
+    `persist` writes one batch of queued operations and can be replaced,
+    e.g. with a slow filesystem stand-in.
+    """
+
+    def __init__(self, path=SCORES_PATH, top_n=TOP_N, persist=None):
+        self.path = os.path.abspath(path)
+        self.top_n = top_n
+        self.persist = persist or self.write_batch
+        self.db = None
+        self.db_lock = threading.Lock()  # the connection
+        self.lock = threading.Lock()  # leaders and pending
+        self.leaders = []  # cached top_n (score, car, duration, played_at), best first
+        self.pending = []  # runs queued but not committed yet
+        self.failed = []  # writes that used up their attempts, retried with the next batch or close()
+        self.data_version = None
+        self.queue = None
+        self.writer = None
+
+    def start(self):
+        """Load the leaderboard and move all writes onto a background thread"""
+        if self.writer is not None:
+            return
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self._run, name="score-writer", daemon=True)
+        self.writer.start()
+        self.queue.put(("refresh",))
+        pygame.register_quit(self.close)  # flush whatever is still queued
+
+    def connect(self):
+        if self.db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            new = not os.path.exists(self.path)
+            self.db = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=FULL")  # fsync every commit, batching keeps them rare
+            self.db.executescript(SCHEMA)
+            if new:
+                self.import_legacy()
+        return self.db
+
+    def import_legacy(self, path=LEGACY_PATH):
+        """Carry an old highscore.txt over as one run, so upgrading keeps the high score"""
+        try:
+            with open(path) as f:
+                score = int(f.read().strip())
+        except (OSError, ValueError):
+            return
+        if score > 0:
+            self.db.execute("INSERT INTO runs (score, played_at) VALUES (?, ?)", (score, os.path.getmtime(path)))
+
+    def record(self, score, car=None, duration=None, played_at=None):
+        """Append a finished run and return the high score including it"""
+        run = (score, car, duration, time.time() if played_at is None else played_at)
+        if self.writer is None:
+            self._refresh()
+        with self.lock:
+            self.pending.append(run)
+            insert_ranked(self.leaders, run, self.top_n)
+            best = self.leaders[0][0]
+        self._submit(("run", run))
+        return best
+
+    def reset_high_score(self):
+        """Clear the leaderboard, keeping the run history"""
+        with self.lock:
+            self.leaders, self.pending = [], []  # queued runs get written before the reset
+        self._submit(("reset",))
+
+    def top(self, n=None):
+        """Best ranked runs as (score, car, duration, played_at), at most top_n"""
+        if self.writer is None:
+            self._refresh()
+        with self.lock:
+            return self.leaders[:n]
+
+    def high_score(self):
+        top = self.top(1)
+        return top[0][0] if top else 0
+
+    def history(self, limit=None):
+        """Every run, newest first (reads the database, keep it off the game loop)"""
+        self.flush()
+        with self.db_lock:
+            return self.connect().execute("SELECT score, car, duration, played_at FROM runs "
+                                          "ORDER BY played_at DESC LIMIT ?",
+                                          (-1 if limit is None else limit,)).fetchall()
+
+    def _submit(self, op):
+        if self.queue is not None:
+            self.queue.put(op)
+        else:
+            self._write([op])
+
+    def _run(self):
+        while True:
+            ops = [self.queue.get()]
+            while True:
+                try:
+                    ops.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in ops
+            self._write([op for op in ops if op is not None])
+            for _ in ops:
+                self.queue.task_done()
+            if stop:
+                return
+
+    def _write(self, ops):
+        writes = self.failed + [op for op in ops if op[0] != "refresh"]
+        self.failed = []
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                if writes:
+                    self.persist(writes)
+                break
+            except (sqlite3.Error, OSError) as e:
+                if attempt + 1 == WRITE_ATTEMPTS:
+                    print(f"Saving scores failed ({e}), keeping them for the next write")
+                    self.failed, writes = writes, []  # still pending, so the leaderboard keeps them
+                    break
+                print(f"Saving scores failed ({e}), retrying")
+                time.sleep(0.5)
+        with self.lock:
+            for op in writes:
+                if op[0] == "run" and op[1] in self.pending:
+                    self.pending.remove(op[1])
+        try:
+            self._refresh()  # pick up runs from other instances
+        except sqlite3.Error:
+            pass  # keep serving the cache
+
+    def write_batch(self, ops):
+        """Write ("run", row) / ("reset",) operations as one transaction"""
+        with self.db_lock:
+            db = self.connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                for op in ops:
+                    if op[0] == "run":
+                        db.execute("INSERT INTO runs (score, car, duration, played_at) VALUES (?, ?, ?, ?)", op[1])
+                    elif op[0] == "reset":
+                        db.execute("UPDATE runs SET ranked = 0 WHERE ranked")
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _refresh(self):
+        """Re-read the top-N when the database changed under us (or on first use)"""
+        with self.db_lock:
+            db = self.connect()
+            version = db.execute("PRAGMA data_version").fetchone()[0]
+            if version == self.data_version:
+                return  # data_version ignores our own commits, the cache has those already
+            rows = db.execute("SELECT score, car, duration, played_at FROM runs WHERE ranked "
+                              "ORDER BY score DESC, played_at LIMIT ?", (self.top_n,)).fetchall()
+            self.data_version = version
+        with self.lock:
+            for run in self.pending:
+                insert_ranked(rows, run, self.top_n)
+            self.leaders = rows
+        if threading.current_thread() is self.writer and pygame.display.get_init():
+            try:
+                pygame.event.post(pygame.event.Event(SCORES_LOADED))
+            except pygame.error:
+                pass  # shutting down
+
+    def flush(self):
+        """Wait until every queued write is on disk"""
+        if self.queue is not None:
+            self.queue.join()
+
+    def close(self):
+        """Flush and stop the writer thread, then close the database"""
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join()
+            self.writer = self.queue = None
+        if self.failed:
+            self._write([])  # a last try for writes that failed earlier
+        with self.db_lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+                self.data_version = None
+
+
+score_store = ScoreStore()
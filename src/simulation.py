@@ -0,0 +1,173 @@
+import random
+from config import WIDTH, HEIGHT, NUM_ENEMY_CARS, TICK_RATE
+from road import Road
+from main_car import MainCar
+from enemy_car import EnemyCar
+from enemy_pool import EnemyPool
+from score import Score
+from collision import check_collision
+from collision_world import CollisionWorld
+from inputs import NO_INPUT
+from profiler import NULL_PROFILER
+from sprite_cache import sprite_cache
+from road_geometry import road_geometry
+from render_queue import RenderQueue
+
+
+class Simulation:
+    """Game logic without rendering: road scroll, player, enemies, collisions, score.
+
+    Runs with or without a pygame display. Inputs are injected per tick and
+    all randomness comes from the seed, so a run can advance as fast as the
+    CPU allows for balance and regression sweeps. start_game drives the same
+    step and only adds event handling and drawing on top.
+    """
+
+    def __init__(self, width=WIDTH, height=HEIGHT, car_number=3, num_enemies=NUM_ENEMY_CARS,
+                 seed=None, tick_rate=TICK_RATE, clock=None, dense=False, load_road_image=False,
+                 profiler=NULL_PROFILER):
+        self.width, self.height = width, height
+        self.tick_rate = tick_rate
+        self.dt = 1 / tick_rate
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.ticks = 0
+        self.dense = dense
+        self.profiler = profiler  # per-phase timing, a no-op unless one is passed in
+        self.render_queue = RenderQueue()
+
+        self.road = Road(width, height, load_image=load_road_image)
+        self.car = MainCar(0, 0, car_number=car_number, screen_size=(width, height))
+        self.reset_player()
+
+        self.world = CollisionWorld()
+        if dense:
+            # NumPy backed traffic for large enemy counts
+            self.enemies = EnemyPool(num_enemies, width, height, seed=seed)
+        else:
+            self.enemies = [EnemyCar(width, height, world=self.world, rng=self.rng) for _ in range(num_enemies)]
+
+        # score counts simulated seconds unless a wall clock is injected
+        self.score = Score(clock=clock or self.sim_time)
+
+    def restart(self, seed=None):
+        """Start a new run in place, in the same state a new Simulation(seed) of this size starts in.
+
+        Keeps the road, cars, grid and their sprites, so a retry allocates
+        nothing; a replay recorded from here still runs from Simulation(seed).
+        """
+        self.seed = seed
+        self.rng.seed(seed)
+        self.ticks = 0
+        self.road.reset()
+        self.reset_player()
+        if self.dense:
+            self.enemies.restart(seed)
+        else:
+            self.world.clear()
+            # spawned in construction order, each only sees the ones before it
+            for enemy_car in self.enemies:
+                enemy_car.spawn()
+        self.score.reset()
+
+    def sim_time(self):
+        return self.ticks / self.tick_rate
+
+    def start_position(self):
+        return (self.width - self.car.width) // 2, self.height - self.car.height
+
+    def reset_player(self):
+        self.car.set_position(*self.start_position())
+
+    def step(self, inputs=NO_INPUT):
+        """Advance one tick and return the enemy the player hit, or None"""
+        phase = self.profiler.phase
+        self.ticks += 1
+        with phase("input"):
+            self.car.steer(inputs, self.dt)
+            self.car.update_position()
+        self.score.update()
+        with phase("road_move"):
+            self.road.move(self.dt)
+
+        score = self.score.get_score()
+        with phase("enemy_move"):
+            if self.dense:
+                self.enemies.step(score, self.dt)
+            else:
+                for enemy_car in self.enemies:
+                    enemy_car.move(score, self.dt)
+        with phase("collision"):
+            return self.colliding_enemy()
+
+    def colliding_enemy(self):
+        if self.dense:
+            for index in self.enemies.overlapping(self.car.rect):
+                view = self.enemies.view(index)
+                if check_collision(None, self.car, view):
+                    return view
+            return None
+        hits = self.world.colliding(self.car)
+        return hits[0] if hits else None
+
+    def draw(self, screen, alpha=1.0):
+        """Draw road, player and enemies interpolated alpha of the way into the last tick"""
+        queue = self.render_queue
+        queue.begin(screen, (self.width, self.height))
+        self.submit(queue, alpha)
+        with self.profiler.phase("flush"):
+            queue.flush()
+
+    def submit(self, queue, alpha=1.0):
+        """Queue road, player and enemies for a frame started with queue.begin()"""
+        phase = self.profiler.phase
+        with phase("road_draw"):
+            self.road.submit(queue, alpha)
+        with phase("sprite_draw"):
+            self.car.submit(queue, alpha)
+            if self.dense:
+                self.enemies.submit(queue, alpha)
+            else:
+                for enemy_car in self.enemies:
+                    enemy_car.submit(queue, alpha)
+
+    def sprite_variants(self, width, height):
+        """(car_number, size, rotation) of every car sprite needed at a window size"""
+        size = road_geometry(width, height).car_size
+        enemies = [self.enemies] if self.dense else self.enemies
+        return {(self.car.car_number, size, 0)} | {(enemy.car_number, size, 180) for enemy in enemies}
+
+    def prepare_resize(self, width, height):
+        """Build the scaled road and car sprites for a new size without touching live state.
+
+        Runs on the resize worker thread; pass the result to resize().
+        """
+        # a road never drawn with blits (renderer backend) doesn't need a scaled copy
+        road = self.road.scaled_image(width, height) if self.road.image is not None else None
+        return {"road": road,
+                "sprites": [sprite_cache.load(*variant) for variant in self.sprite_variants(width, height)]}
+
+    def resize(self, width, height, prepared=None):
+        """Rescale everything to a new window size, from prepare_resize() output when given"""
+        self.width, self.height = width, height
+        if prepared:
+            for key, surface in prepared["sprites"]:
+                sprite_cache.store(key, surface)
+        self.road.set_size(width, height, prepared["road"] if prepared else None)
+        self.car.update_screen_size(width, height)
+        if self.dense:
+            self.enemies.update_screen_size(width, height)
+        else:
+            for enemy_car in self.enemies:
+                enemy_car.update_screen_size(width, height)
+
+    def run(self, max_ticks, inputs=None):
+        """Step until a crash or max_ticks; inputs(tick) supplies steering.
+
+        Returns (ticks run, final score, enemy hit or None).
+        """
+        for _ in range(max_ticks):
+            hit = self.step(inputs(self.ticks) if inputs else NO_INPUT)
+            if hit is not None:
+                return self.ticks, self.score.get_score(), hit
+        return self.ticks, self.score.get_score(), None
@@ -0,0 +1,73 @@
+import weakref
+import pygame
+from sprite_cache import drop_car_sprite, get_car_sprite
+
+
+class SpriteEntry:
+    """One shared sprite variant: the surface, its collision mask and a ref count"""
+
+    def __init__(self, key, image):
+        self.key = key
+        self.image = image
+        self.mask = pygame.mask.from_surface(image)
+        self.refs = 0
+
+
+class SpriteAtlas:
+    """Registry that hands out one surface and mask per (car_number, size, rotation).
+
+    Cars borrow entries instead of owning private copies. Every borrow is
+    reference counted, and a variant is dropped as soon as nobody uses it
+    (e.g. the old size after a window resize), together with the sprite
+    cache's memory copy through `unloader`.
+    """
+
+    def __init__(self, loader=get_car_sprite, unloader=drop_car_sprite):
+        self.loader = loader
+        self.unloader = unloader
+        self.entries = {}
+        self.loans = weakref.WeakKeyDictionary()  # owner -> finalizer releasing its entry
+
+    def acquire(self, car_number, size, rotation=0):
+        key = (car_number, (int(size[0]), int(size[1])), rotation % 360)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = SpriteEntry(key, self.loader(car_number, key[1], key[2]))
+            self.entries[key] = entry
+        entry.refs += 1
+        return entry
+
+    def release(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return
+        entry.refs -= 1
+        if entry.refs <= 0:
+            del self.entries[key]
+            if self.unloader is not None:
+                self.unloader(*key)
+
+    def borrow(self, owner, car_number, size, rotation=0):
+        """Acquire an entry for owner, giving back whatever owner borrowed before.
+
+        The entry is also released automatically when owner is garbage collected.
+        """
+        entry = self.acquire(car_number, size, rotation)
+        self.give_back(owner)
+        self.loans[owner] = weakref.finalize(owner, self.release, entry.key)
+        return entry
+
+    def give_back(self, owner):
+        finalizer = self.loans.pop(owner, None)
+        if finalizer is not None:
+            finalizer()
+
+    def refcount(self, car_number, size, rotation=0):
+        entry = self.entries.get((car_number, tuple(size), rotation % 360))
+        return entry.refs if entry else 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+sprite_atlas = SpriteAtlas()
@@ -0,0 +1,120 @@
+import hashlib
+import mmap
+import os
+import struct
+import pygame
+from sprite_cleaner import CLEANING_PARAMS
+
+BUNDLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets.bundle")
+
+MAGIC = b"CARB"
+VERSION = 2
+HEADER = struct.Struct("<4sB3xI4B4s")     # magic, version, entry count, background keying params, pixel order
+ENTRY = struct.Struct("<24s16sHHB3xQ")    # asset name, source digest, width, height, flags, data offset
+ALIGN = 64
+
+FLAG_PREMULTIPLIED = 1
+FLAG_OPAQUE = 2
+
+# byte order of SDL's ARGB8888, the usual display format, so tiers blit without conversion
+PIXEL_ORDER = "BGRA"
+
+
+def source_digest(path):
+    """Content hash of a source image, stored per entry to spot assets changed since the bake"""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+class BundleEntry:
+    """One baked tier of an asset inside the bundle"""
+
+    def __init__(self, name, digest, width, height, flags, offset):
+        self.name, self.digest = name, digest
+        self.width, self.height = width, height
+        self.flags, self.offset = flags, offset
+
+    @property
+    def size(self):
+        return self.width * self.height * 4
+
+
+class SpriteBundle:
+    """Read side of a baked asset bundle (see bake.py).
+
+    Only the index is parsed up front. Surfaces are built straight over the
+    mapped pixels with frombuffer, so nothing is decoded or copied and a tier
+    only takes memory once its pages are actually read. The mapping is copy
+    on write: a surface that gets drawn on never touches the file.
+    """
+
+    def __init__(self, path=BUNDLE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.view = memoryview(self.map)
+        magic, version, count, *params, order = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} asset bundle")
+        self.order = order.decode()
+        if tuple(params) != CLEANING_PARAMS:
+            raise ValueError(f"{path} was baked with other background keying parameters")
+        self.entries = {}  # asset name -> [BundleEntry] sorted by width
+        for i in range(count):
+            name, digest, width, height, flags, offset = ENTRY.unpack_from(self.map, HEADER.size + i * ENTRY.size)
+            entry = BundleEntry(name.rstrip(b"\0").decode(), digest.decode(), width, height, flags, offset)
+            self.entries.setdefault(entry.name, []).append(entry)
+        for tiers in self.entries.values():
+            tiers.sort(key=lambda entry: entry.width)
+
+    def names(self):
+        return list(self.entries)
+
+    def pick(self, name, width=None):
+        """Smallest tier at least `width` wide (the largest one if none is), or None"""
+        tiers = self.entries.get(name)
+        if not tiers:
+            return None
+        if width is not None:
+            for entry in tiers:
+                if entry.width >= width:
+                    return entry
+        return tiers[-1]
+
+    def surface(self, entry):
+        """Surface over one tier's pixels in the mapping (no copy)"""
+        return pygame.image.frombuffer(self.view[entry.offset:entry.offset + entry.size],
+                                       (entry.width, entry.height), self.order)
+
+    def close(self):
+        """Unmap the file; fails while surfaces over it are still alive"""
+        self.view.release()
+        self.map.close()
+
+
+def write_bundle(path, entries, order=PIXEL_ORDER):
+    """Pack (name, digest, surface, flags) tiers into one bundle file, atomically"""
+    index, blobs, offset = [], [], HEADER.size + ENTRY.size * len(entries)
+    for name, digest, surface, flags in entries:
+        offset += -offset % ALIGN
+        data = pygame.image.tostring(surface, order)
+        index.append(ENTRY.pack(name.encode(), digest.encode(), *surface.get_size(), flags, offset))
+        blobs.append((offset, data))
+        offset += len(data)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(entries), *CLEANING_PARAMS, order.encode()))
+        f.write(b"".join(index))
+        for offset, data in blobs:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+def open_bundle(path=BUNDLE_PATH):
+    """The baked bundle if one exists and is readable, else None (assets are cleaned at runtime)"""
+    try:
+        return SpriteBundle(path)
+    except (OSError, ValueError, struct.error, UnicodeDecodeError):
+        return None
@@ -0,0 +1,232 @@
+import os
+import threading
+from collections import OrderedDict
+import pygame
+from sprite_cleaner import ASSETS_DIR, CLEANING_PARAMS, load_clean_car
+from sprite_bundle import PIXEL_ORDER, open_bundle, source_digest
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".sprite_cache")
+MIN_MIP_WIDTH = 64  # smallest level of a car's mip chain, cars are at least 60 px wide
+
+
+def to_display_format(surface, opaque=False):
+    """Surface in the display's pixel format.
+
+    Surfaces that already match (mapped bundle tiers, anything scaled from
+    them) are returned as is instead of being copied by convert_alpha().
+    """
+    if not pygame.display.get_surface():
+        return surface
+    if opaque:
+        return surface.convert()
+    if surface.get_bitsize() == 32 and surface.get_masks() == _display_alpha_masks():
+        return surface
+    return surface.convert_alpha()
+
+
+def _display_alpha_masks():
+    return pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+
+
+class SpriteCache:
+    """Two tier (memory + disk) cache of cleaned, scaled and rotated car sprites.
+
+    Entries are keyed by the source file's content hash, car number, target
+    size, rotation and the background keying parameters. The disk tier keeps
+    raw pixels in the bundle's order, so a cold start only costs a file read.
+
+    Each sprite is smoothscaled from the nearest level at least as wide: the
+    baked tiers when a current asset bundle exists, else a mip chain of
+    the cleaned original (halving down to MIN_MIP_WIDTH) built once per car.
+    Either way a new size is a small refine, never a downscale from the full
+    source. All sprites have premultiplied alpha.
+
+    load() never touches the memory tier or the display, so resizes can build
+    sprites on a worker thread and store() them from the main thread.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, memory_entries=32, disk_bytes=64 * 1024 * 1024, bundle=None):
+        self.cache_dir = cache_dir
+        self.bundle = bundle  # baked SpriteBundle, optional
+        self.memory_entries = memory_entries
+        self.disk_bytes = disk_bytes
+        self.memory = OrderedDict()
+        self.hashes = {}  # path -> (mtime, size, digest)
+        self.mips = {}  # car_number -> (digest, [cleaned surfaces, full size first, halving])
+        self.locks = {}  # car_number -> lock, so different cars can decode in parallel
+        self.lock = threading.Lock()
+
+    def source_hash(self, path):
+        """Content hash of a source image, re-hashed only when the file changes"""
+        stat = os.stat(path)
+        cached = self.hashes.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        digest = source_digest(path)
+        self.hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def asset_digest(self, name):
+        """Content hash of assets/<name>, or the baked one when only the bundle ships"""
+        path = os.path.join(ASSETS_DIR, name)
+        if os.path.exists(path) or self.bundle is None:
+            return self.source_hash(path)
+        entry = self.bundle.pick(name)
+        if entry is None:
+            raise FileNotFoundError(path)
+        return entry.digest
+
+    def baked(self, name, width=None):
+        """Bundle tier to use for an asset, or None when there is no current one"""
+        if self.bundle is None:
+            return None
+        entry = self.bundle.pick(name, width)
+        if entry is None or entry.digest != self.asset_digest(name):
+            return None  # asset changed since the bake
+        return entry
+
+    def make_key(self, car_number, size, rotation=0):
+        params = "-".join(str(p) for p in CLEANING_PARAMS)
+        name = f"car{car_number}.png"
+        entry = self.baked(name, size[0])
+        source = f"t{entry.width}" if entry else "mip"
+        return (f"car{car_number}_{self.asset_digest(name)}_{size[0]}x{size[1]}_r{rotation % 360}"
+                f"_k{params}_pm_{PIXEL_ORDER.lower()}_{source}")
+
+    def get(self, car_number, size, rotation=0):
+        """Return the sprite for (car_number, size, rotation), building it on a miss"""
+        size = (int(size[0]), int(size[1]))
+        key = self.make_key(car_number, size, rotation)
+
+        # memory tier
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        return self.store(*self.load(car_number, size, rotation))
+
+    def load(self, car_number, size, rotation=0):
+        """(key, surface) from the disk tier or a fresh build, skipping the memory tier"""
+        size = (int(size[0]), int(size[1]))
+        key = self.make_key(car_number, size, rotation)
+        surface = self.read_disk(key, size, rotation)
+        if surface is None:
+            surface = self.build(car_number, size, rotation)
+            self.write_disk(key, surface, rotation)
+        return key, surface
+
+    def store(self, key, surface):
+        """Put a loaded sprite in the memory tier, converted to the display format"""
+        surface = to_display_format(surface)
+        self.memory[key] = surface
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+        return surface
+
+    def source(self, car_number, width):
+        """Level to scale a `width` wide sprite from: a baked tier or a mip of the cleaned original"""
+        entry = self.baked(f"car{car_number}.png", width)
+        if entry is not None:
+            return self.bundle.surface(entry)
+        chain = self.mip_chain(car_number)
+        return next((level for level in reversed(chain) if level.get_width() >= width), chain[0])
+
+    def discard(self, car_number, size, rotation=0):
+        """Drop a sprite from the memory tier (the disk tier keeps it)"""
+        self.memory.pop(self.make_key(car_number, (int(size[0]), int(size[1])), rotation), None)
+
+    def original(self, car_number):
+        """Cleaned, premultiplied full size image"""
+        return self.mip_chain(car_number)[0]
+
+    def mip_chain(self, car_number):
+        """Cleaned image at halving widths, decoded and keyed once per source file version"""
+        digest = self.asset_digest(f"car{car_number}.png")
+        with self.lock:
+            lock = self.locks.setdefault(car_number, threading.Lock())
+        with lock:
+            cached = self.mips.get(car_number)
+            if cached is None or cached[0] != digest:
+                chain = [load_clean_car(car_number, convert=False).premul_alpha()]
+                while chain[-1].get_width() // 2 >= MIN_MIP_WIDTH:
+                    width, height = chain[-1].get_size()
+                    chain.append(pygame.transform.smoothscale(chain[-1], (width // 2, height // 2)))
+                cached = self.mips[car_number] = (digest, chain)
+        return cached[1]
+
+    def build(self, car_number, size, rotation=0):
+        source = self.source(car_number, size[0])
+        # the level is at most about twice the target, so the filtered refine stays cheap
+        surface = source if source.get_size() == size else pygame.transform.smoothscale(source, size)
+        if rotation % 360:
+            surface = pygame.transform.rotate(surface, rotation)
+        return surface
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".rgba")
+
+    def read_disk(self, key, size, rotation=0):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        surf_size = size if rotation % 180 == 0 else (size[1], size[0])
+        if len(data) != surf_size[0] * surf_size[1] * 4:
+            return None
+        try:
+            os.utime(path)  # bump for LRU eviction
+        except OSError:
+            pass
+        return pygame.image.frombuffer(data, surf_size, PIXEL_ORDER)
+
+    def write_disk(self, key, surface, rotation=0):
+        if rotation % 90:
+            return  # odd rotations change the size, keep them in memory only
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"  # one per writer thread
+            with open(tmp_path, "wb") as f:
+                f.write(pygame.image.tostring(surface, PIXEL_ORDER))
+            os.replace(tmp_path, self._path(key))
+            self.evict_disk()
+        except OSError:
+            pass  # the cache is an optimization, never fail the game over it
+
+    def evict_disk(self):
+        """Drop least recently used files until the disk tier fits its size cap"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".rgba"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self, disk=False):
+        self.memory.clear()
+        self.mips.clear()
+        if disk and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+sprite_cache = SpriteCache(bundle=open_bundle())
+
+
+def get_car_sprite(car_number, size, rotation=0):
+    """Cleaned car sprite scaled to size and rotated, served from the shared cache"""
+    return sprite_cache.get(car_number, size, rotation)
+
+
+def drop_car_sprite(car_number, size, rotation=0):
+    """Let go of a sprite nobody draws anymore, so its pixels are freed"""
+    sprite_cache.discard(car_number, size, rotation)
@@ -0,0 +1,71 @@
+import os
+import re
+import numpy as np
+import pygame
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+CAR_NAME = re.compile(r"car(\d+)\.png")  # car images get background keyed, group 1 is the car number
+
+# background keying thresholds (same values the old per-pixel loops used)
+WHITE_THRESHOLD = 240
+GRAY_THRESHOLD = 220
+GRAY_MAX_DELTA = 20
+ALPHA_THRESHOLD = 10
+CLEANING_PARAMS = (WHITE_THRESHOLD, GRAY_THRESHOLD, GRAY_MAX_DELTA, ALPHA_THRESHOLD)
+
+# cleaned car sprites carry premultiplied alpha, blit them with this flag
+SPRITE_BLEND = pygame.BLEND_PREMULTIPLIED
+
+
+def car_asset_path(car_number):
+    """Path of the source image for a car number"""
+    return os.path.join(ASSETS_DIR, f"car{car_number}.png")
+
+
+def background_mask(rgb, alpha):
+    """Boolean (w, h) array that is True where a pixel counts as background"""
+    rgb = rgb.astype(np.int16)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    # pure white or near white
+    white = (r > WHITE_THRESHOLD) & (g > WHITE_THRESHOLD) & (b > WHITE_THRESHOLD)
+    # light gray/off-white
+    gray = ((r > GRAY_THRESHOLD) & (g > GRAY_THRESHOLD) & (b > GRAY_THRESHOLD)
+            & (np.abs(r - g) < GRAY_MAX_DELTA) & (np.abs(g - b) < GRAY_MAX_DELTA))
+    # already transparent
+    clear = alpha < ALPHA_THRESHOLD
+    return white | gray | clear
+
+
+def remove_background(surface):
+    """Return a new SRCALPHA surface with the white/gray background keyed out.
+
+    Works on whole arrays through surfarray, so it gives the same pixels the
+    old get_at/set_at loops did: kept pixels are copied as-is and background
+    pixels become (0, 0, 0, 0).
+    """
+    rgb = pygame.surfarray.array3d(surface)
+    alpha = pygame.surfarray.array_alpha(surface)
+    keep = ~background_mask(rgb, alpha)
+
+    cleaned = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+    out_rgb = pygame.surfarray.pixels3d(cleaned)
+    out_rgb[...] = rgb * keep[..., None]
+    del out_rgb
+    out_alpha = pygame.surfarray.pixels_alpha(cleaned)
+    out_alpha[...] = alpha * keep
+    del out_alpha
+    return cleaned
+
+
+def load_clean_car(car_number, convert=True):
+    """Load a car image from assets/ and strip its background.
+
+    Pass convert=False off the main thread to skip the display format conversion.
+    """
+    convert = convert and pygame.display.get_surface() is not None
+    original = pygame.image.load(car_asset_path(car_number))
+    if convert:
+        original = original.convert_alpha()
+    cleaned = remove_background(original)
+    return cleaned.convert_alpha() if convert else cleaned
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+import pygame
+
+
+class TextRenderer:
+    """Font and rendered-text cache for the HUD, menus and game over screen.
+
+    Fonts are built once per (face, size) since constructing one reads and
+    parses the font file. Rendered surfaces are kept in an LRU keyed by
+    (text, size, color, antialias, face), so unchanged text is never
+    re-rendered.
+    """
+
+    def __init__(self, max_surfaces=256):
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def font(self, size, face=None):
+        key = (face, int(size))
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(face, int(size))
+        return font
+
+    def render(self, text, size, color, antialias=True, face=None):
+        key = (text, int(size), tuple(color), antialias, face)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.font(size, face).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.fonts.clear()
+        self.surfaces.clear()
+
+
+text_renderer = TextRenderer()
+
+
+def get_font(size, face=None):
+    """Shared Font object for (face, size)"""
+    return text_renderer.font(size, face)
+
+
+def render_text(text, size, color, antialias=True, face=None):
+    """Rendered text surface, cached; callers must not draw onto it"""
+    return text_renderer.render(text, size, color, antialias, face)
@@ -0,0 +1,147 @@
+import weakref
+import numpy as np
+import pygame
+from config import RENDER_BACKEND
+from sprite_cleaner import SPRITE_BLEND
+
+try:
+    from pygame._sdl2.sdl2 import error as SDLError
+    from pygame._sdl2.video import Renderer, Texture, Window
+except ImportError:  # pygame built without SDL2 video bindings
+    Renderer = Texture = Window = None
+    SDLError = pygame.error
+
+# SDL_BLENDFACTOR_ONE, SDL_BLENDFACTOR_ONE_MINUS_SRC_ALPHA, SDL_BLENDOPERATION_ADD
+PREMULTIPLIED_BLEND = ((2, 6, 1), (2, 6, 1))
+
+
+def unpremultiply(surface):
+    """Straight alpha copy of a premultiplied surface"""
+    straight = surface.copy()
+    alpha = pygame.surfarray.pixels_alpha(straight)
+    rgb = pygame.surfarray.pixels3d(straight)
+    scale = np.where(alpha > 0, 255 / np.maximum(alpha, 1), 0)[..., None]
+    rgb[:] = np.minimum(rgb * scale + 0.5, 255).astype(np.uint8)
+    del alpha, rgb  # unlock the surface
+    return straight
+
+
+class TextureCanvas:
+    """Gameplay draw target backed by pygame's SDL2 Renderer.
+
+    Implements the part of the Surface API the gameplay draw path uses
+    (blit, blits, fill, get_size), so Simulation.draw and the HUD work
+    unchanged. Each surface is uploaded to a texture once and kept while the
+    surface is alive. draw_scaled() lets the road stretch its original strip
+    on the renderer, so scrolling never copies window sized pixel buffers.
+
+    Drawing happens at a logical size that the renderer stretches over the
+    window, which is how a resize in progress is shown. Uses hardware
+    acceleration when available; SDL's software renderer works too.
+    present() waits for vsync unless vsync=False (benchmarks).
+    """
+
+    def __init__(self, size, title="2D Car Game", accelerated=-1, vsync=True):
+        # a window can't have a display surface and a renderer at once,
+        # so the display module's window makes way while the canvas is up
+        pygame.display.quit()
+        pygame.display.init()
+        self.window = Window(title, size, resizable=True)
+        self.renderer = Renderer(self.window, accelerated=accelerated, vsync=vsync)
+        self.textures = weakref.WeakKeyDictionary()  # surface -> {blend flags: Texture}
+        # blend mode for premultiplied sprites, None once the renderer turned it down
+        self.premultiplied = self.renderer.compose_custom_blend_mode(*PREMULTIPLIED_BLEND)
+        self.scale = (1.0, 1.0)
+        self.logical_size = tuple(size)
+
+    def get_size(self):
+        return self.window.size
+
+    def get_width(self):
+        return self.window.size[0]
+
+    def get_height(self):
+        return self.window.size[1]
+
+    def begin_frame(self, logical_size):
+        """Clear the back buffer; everything drawn this frame is stretched from logical_size"""
+        width, height = self.window.size
+        self.logical_size = tuple(logical_size)
+        self.scale = (width / logical_size[0], height / logical_size[1])
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+
+    def texture(self, surface, special_flags=0):
+        """Texture for a surface, uploaded on first use"""
+        textures = self.textures.setdefault(surface, {})
+        texture = textures.get(special_flags)
+        if texture is None:
+            texture = None
+            if special_flags == SPRITE_BLEND and self.premultiplied is not None:
+                texture = Texture.from_surface(self.renderer, surface)
+                try:
+                    texture.blend_mode = self.premultiplied
+                except SDLError:
+                    # the software renderer has no custom blend modes
+                    self.premultiplied = texture = None
+            if texture is None:
+                if special_flags == SPRITE_BLEND:
+                    surface = unpremultiply(surface)
+                texture = Texture.from_surface(self.renderer, surface)
+            textures[special_flags] = texture
+        return texture
+
+    def _dest(self, x, y, width, height):
+        # positions truncate like Surface.blit's
+        sx, sy = self.scale
+        return pygame.Rect(int(x * sx), int(y * sy), round(width * sx), round(height * sy))
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        x, y = dest[:2]
+        width, height = (area[2], area[3]) if area else source.get_size()
+        self.texture(source, special_flags).draw(area, self._dest(x, y, width, height))
+        return pygame.Rect(int(x), int(y), width, height)
+
+    def blits(self, blit_sequence, doreturn=True):
+        rects = [self.blit(*args) for args in blit_sequence]
+        return rects if doreturn else None
+
+    def draw_scaled(self, source, rect):
+        """Stretch a whole surface over a rect, scaled by the renderer"""
+        self.texture(source).draw(None, self._dest(*rect))
+
+    def fill(self, color, rect=None):
+        self.renderer.draw_color = color
+        if rect is None:
+            self.renderer.clear()
+        else:
+            self.renderer.fill_rect(self._dest(*rect))
+        return pygame.Rect(rect) if rect else pygame.Rect((0, 0), self.logical_size)
+
+    def present(self):
+        self.renderer.present()
+
+    def close(self):
+        """Destroy the window, after which pygame.display.set_mode works again"""
+        self.textures.clear()
+        del self.renderer
+        self.window.destroy()
+
+
+def open_canvas(size, backend=RENDER_BACKEND):
+    """TextureCanvas for the configured backend, or None for the blit path.
+
+    Falls back to the blit path, with a regular display window, when the
+    SDL2 renderer is unavailable.
+    """
+    if not backend.startswith("sdl2"):
+        return None
+    try:
+        if Renderer is None:
+            raise SDLError("pygame._sdl2 is not available")
+        # "sdl2-software" forces SDL's software renderer, for machines without a GPU
+        return TextureCanvas(size, accelerated=0 if backend == "sdl2-software" else -1)
+    except (pygame.error, SDLError) as e:
+        print(f"SDL2 renderer unavailable ({e}), drawing with blits")
+        pygame.display.set_mode(size, pygame.RESIZABLE)
+        return None
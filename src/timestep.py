@@ -0,0 +1,34 @@
+from config import TICK_RATE
+
+
+def lerp(start, end, alpha):
+    return start + (end - start) * alpha
+
+
+class FixedTimestep:
+    """Accumulator that turns variable frame times into fixed simulation ticks.
+
+    The game steps its simulation at tick_rate no matter how fast frames are
+    rendered; alpha is how far the current frame sits between the last two
+    ticks and is used to interpolate drawing positions.
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, max_frame_time=0.25):
+        self.dt = 1 / tick_rate
+        self.max_frame_time = max_frame_time  # avoid a spiral of death after stalls
+        self.accumulator = 0.0
+
+    def add_frame(self, frame_time):
+        """Add a frame's duration in seconds and return how many ticks to run"""
+        self.accumulator += min(frame_time, self.max_frame_time)
+        ticks = int(self.accumulator // self.dt)
+        self.accumulator -= ticks * self.dt
+        return ticks
+
+    def reset(self):
+        """Drop pending time, e.g. after pausing or a game over screen"""
+        self.accumulator = 0.0
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.dt
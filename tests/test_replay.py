@@ -0,0 +1,68 @@
+"""A recorded run replays to the same collision tick and score, also after a restart"""
+import os
+import random
+import sys
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from inputs import Inputs  # noqa: E402
+from replay import Replay, ReplayRecorder, run_headless  # noqa: E402
+from simulation import Simulation  # noqa: E402
+
+SIZE = (820, 700)
+NUM_ENEMIES = 3
+MAX_TICKS = 3000
+RESIZES = {20: (1000, 800), 45: (700, 650), 70: SIZE}  # tick -> new window size
+
+
+def play(sim, recorder, seed):
+    """Drive sim with seeded random steering and resizes, recording every tick"""
+    steering = random.Random(seed)
+    inputs = Inputs(False, False, False, False)
+    hit = None
+    while hit is None and sim.ticks < MAX_TICKS:
+        if sim.ticks in RESIZES:
+            recorder.record_resize(*RESIZES[sim.ticks])
+            sim.resize(*RESIZES[sim.ticks])
+        if sim.ticks % 15 == 0:
+            inputs = Inputs(*(steering.random() < 0.3 for _ in range(4)))
+        hit = sim.step(inputs)
+        recorder.record_tick(inputs)
+    recorder.finish(sim.ticks if hit is not None else None, sim.score.get_score())
+    return recorder.replay
+
+
+def replay_outcome(replay, tmp_path):
+    path = tmp_path / f"{replay.seed}.replay"
+    replay.save(str(path))
+    collision_tick, score, _ = run_headless(Replay.load(str(path)))
+    return collision_tick, score
+
+
+def new_recorder(sim):
+    return ReplayRecorder(sim.seed, sim.tick_rate, (sim.width, sim.height), sim.car.car_number, NUM_ENEMIES)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_replay_reproduces_collision_tick_and_score(seed, tmp_path):
+    sim = Simulation(*SIZE, num_enemies=NUM_ENEMIES, seed=seed)
+    replay = play(sim, new_recorder(sim), seed)
+    assert replay_outcome(replay, tmp_path) == (replay.collision_tick, replay.final_score)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_restart_replays_like_a_new_simulation(seed, tmp_path):
+    sim = Simulation(*SIZE, num_enemies=NUM_ENEMIES, seed=1000 + seed)
+    play(sim, new_recorder(sim), seed)  # leave enemies, road and score mid-run
+
+    sim.restart(seed)
+    fresh = Simulation(sim.width, sim.height, num_enemies=NUM_ENEMIES, seed=seed)
+    assert [(e.x, e.y, e.speed) for e in sim.enemies] == [(e.x, e.y, e.speed) for e in fresh.enemies]
+    assert (sim.car.x, sim.car.y, sim.road.y1, sim.ticks, sim.score.get_score()) == \
+        (fresh.car.x, fresh.car.y, fresh.road.y1, fresh.ticks, fresh.score.get_score())
+
+    replay = play(sim, new_recorder(sim), seed)
+    assert replay_outcome(replay, tmp_path) == (replay.collision_tick, replay.final_score)
@@ -0,0 +1,99 @@
+"""ScoreStore's writer thread, driven through a slow (and a failing) filesystem stand-in"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import score_store  # noqa: E402
+from score_store import ScoreStore  # noqa: E402
+
+
+class SlowFilesystem:
+    """persist stand-in that holds every write until `gate` is set, recording batch sizes"""
+
+    def __init__(self, store, delay=0.2):
+        self.store, self.delay = store, delay
+        self.gate = threading.Event()
+        self.batches = []
+
+    def __call__(self, ops):
+        self.gate.wait()
+        time.sleep(self.delay)
+        self.batches.append(len(ops))
+        self.store.write_batch(ops)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScoreStore(str(tmp_path / "scores.db"))
+    store.persist = SlowFilesystem(store)
+    store.start()
+    yield store
+    store.persist.gate.set()
+    store.close()
+
+
+def test_record_does_not_wait_for_the_disk(store):
+    start = time.perf_counter()
+    best = store.record(42, 3, 12.5)
+    assert time.perf_counter() - start < 0.05
+    assert best == 42
+    assert store.high_score() == 42  # served from the cache before anything is written
+
+
+def test_queued_runs_commit_in_one_batch(store):
+    store.record(10)
+    time.sleep(0.05)  # the writer picks the first run up and blocks on the gate
+    for score in (20, 30, 40, 50):
+        store.record(score)
+    store.persist.gate.set()
+    store.flush()
+    assert store.persist.batches == [1, 4]
+    assert sorted(run[0] for run in store.history()) == [10, 20, 30, 40, 50]
+
+
+def test_close_commits_queued_runs(store, tmp_path):
+    for score in (5, 15):
+        store.record(score)
+    store.persist.gate.set()
+    store.close()
+    with sqlite3.connect(str(tmp_path / "scores.db")) as db:
+        assert sorted(row[0] for row in db.execute("SELECT score FROM runs")) == [5, 15]
+
+
+def test_reset_keeps_history(store):
+    store.persist.gate.set()
+    store.record(70)
+    store.record(30)
+    store.reset_high_score()
+    assert store.high_score() == 0
+    store.flush()
+    assert store.high_score() == 0
+    assert sorted(run[0] for run in store.history()) == [30, 70]
+
+
+def test_failed_writes_stay_queued(tmp_path, monkeypatch):
+    monkeypatch.setattr(score_store.time, "sleep", lambda seconds: None)
+    store = ScoreStore(str(tmp_path / "scores.db"))
+    calls = []
+
+    def broken(ops):
+        calls.append(len(ops))
+        raise OSError("disk full")
+
+    store.persist = broken
+    store.start()
+    store.record(50)
+    store.flush()
+    assert calls == [1] * score_store.WRITE_ATTEMPTS
+    assert store.high_score() == 50  # still on the leaderboard
+
+    store.persist = store.write_batch
+    store.close()  # retries the failed write
+    assert [run[0] for run in store.history()] == [50]
+    store.close()
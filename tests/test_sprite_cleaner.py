@@ -0,0 +1,75 @@
+"""remove_background must key exactly the pixels the original get_at/set_at loop did"""
+import os
+import sys
+
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from sprite_cleaner import ASSETS_DIR, car_asset_path, remove_background  # noqa: E402
+
+CAR_NUMBERS = sorted(int(name[3:-4]) for name in os.listdir(ASSETS_DIR)
+                     if name.startswith("car") and name.endswith(".png"))
+
+# pixels on both sides of every threshold: white 240/241, gray 220/221,
+# gray channel delta 19/20 and alpha 9/10 (anything past the white edge is
+# light gray as well, so those pixels only check the two rules agree)
+EDGE_PIXELS = [
+    (241, 241, 241, 255), (240, 240, 240, 255), (241, 241, 240, 255),
+    (221, 221, 221, 255), (220, 220, 220, 255), (221, 221, 220, 255),
+    (221, 240, 221, 255), (221, 241, 221, 255), (240, 221, 240, 255), (241, 221, 241, 255),
+    (230, 249, 230, 255), (230, 250, 230, 255), (249, 230, 249, 255), (250, 230, 250, 255),
+    (50, 60, 70, 9), (50, 60, 70, 10), (255, 255, 255, 9), (0, 0, 0, 0), (200, 30, 30, 255),
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+def reference_clean(original):
+    """The per-pixel keying loop MainCar and EnemyCar used before sprite_cleaner"""
+    cleaned_surface = pygame.Surface(original.get_size(), pygame.SRCALPHA)
+    cleaned_surface.fill((0, 0, 0, 0))
+    for x in range(original.get_width()):
+        for y in range(original.get_height()):
+            pixel = original.get_at((x, y))
+            r, g, b, a = pixel[0], pixel[1], pixel[2], pixel[3] if len(pixel) > 3 else 255
+            is_background = False
+            if r > 240 and g > 240 and b > 240:
+                is_background = True
+            elif r > 220 and g > 220 and b > 220 and abs(r-g) < 20 and abs(g-b) < 20:
+                is_background = True
+            elif a < 10:
+                is_background = True
+            if not is_background:
+                cleaned_surface.set_at((x, y), pixel)
+    return cleaned_surface
+
+
+def assert_same_pixels(actual, expected):
+    assert actual.get_size() == expected.get_size()
+    assert pygame.image.tostring(actual, "RGBA") == pygame.image.tostring(expected, "RGBA")
+
+
+@pytest.mark.parametrize("car_number", CAR_NUMBERS)
+def test_matches_reference_loop_for_car_assets(car_number):
+    original = pygame.image.load(car_asset_path(car_number)).convert_alpha()
+    assert_same_pixels(remove_background(original), reference_clean(original))
+
+
+def test_matches_reference_loop_at_thresholds():
+    original = pygame.Surface((len(EDGE_PIXELS), 1), pygame.SRCALPHA)
+    for x, pixel in enumerate(EDGE_PIXELS):
+        original.set_at((x, 0), pixel)
+    cleaned = remove_background(original)
+    assert_same_pixels(cleaned, reference_clean(original))
+    # both sides of each edge really are there: some edge pixels kept, some keyed
+    alphas = [cleaned.get_at((x, 0))[3] for x in range(len(EDGE_PIXELS))]
+    assert 0 in alphas and any(alphas)